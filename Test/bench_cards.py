@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark the transaction service's card validation.
+
+Each validator checks the same CARDS cards (number, expiry, CVV), about
+three quarters of them valid and the rest failing one check each:
+  • tables   transaction_verification/src/cards.py: Luhn from a table of
+             digit groups, BIN lookup through a prefix dict and bisect over
+             the flattened range table, expiry and CVV as set lookups
+  • naive    per-digit Luhn loop, linear scan over the BIN table, expiry
+             parsed and compared per card
+then prints ns per card, cards per second (one core), and how many results
+differ from the tables validator.
+
+Usage: python bench_cards.py [cards]
+"""
+
+import os, sys, time, random, csv
+from datetime import datetime, timezone
+
+SRC = os.path.abspath(os.path.join(__file__, '../../transaction_verification/src'))
+sys.path.insert(0, SRC)
+
+from cards import BinIndex, CardValidator
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+CARDS   = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+BINS    = os.path.join(SRC, "bins.csv")
+ROUNDS  = 3             # best of
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class NaiveValidator:
+    def __init__(self, path):
+        with open(path, newline="") as f:
+            self.rows = list(csv.DictReader(f))
+
+    def check(self, number, expiration, cvv):
+        if not (number.isascii() and number.isdigit() and 12 <= len(number) <= 19):
+            return "Invalid credit card number"
+        total = 0
+        for position, digit in enumerate(reversed(number)):
+            digit = int(digit)
+            if position % 2:
+                digit *= 2
+                if digit > 9:
+                    digit -= 9
+            total += digit
+        if total % 10:
+            return "Invalid credit card number"
+        best = None
+        for row in self.rows:
+            low, high = row["low"], row["high"]
+            if int(low) <= int(number[:len(low)]) and int(number[:len(high)]) <= int(high):
+                width = int(high.ljust(8, "9")) - int(low.ljust(8, "0"))
+                if best is None or width < best[0]:
+                    best = (width, row)
+        if best is None:
+            return "Unknown card issuer"
+        row = best[1]
+        lengths = set()
+        for part in row["lengths"].split():
+            first, _, last = part.partition("-")
+            lengths.update(range(int(first), int(last or first) + 1))
+        if len(number) not in lengths:
+            return f"Invalid card number length for {row['scheme']}"
+        try:
+            month, year = expiration.split("/")
+            month, year = int(month), int(year)
+            year += 2000 if len(expiration) == 5 else 0
+        except ValueError:
+            return "Card expired or invalid expiration date"
+        today = datetime.now(timezone.utc)
+        if not 1 <= month <= 12 or (year, month) < (today.year, today.month) or year > today.year + 20 \
+                or (year == today.year + 20 and month > today.month) or len(expiration) not in (5, 7):
+            return "Card expired or invalid expiration date"
+        if not (cvv.isascii() and cvv.isdigit() and len(cvv) == int(row["cvv_length"])):
+            return "Invalid CVV"
+        return None
+
+
+def luhn_complete(digits):
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        digit = int(digit)
+        if position % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return digits + str(-total % 10)
+
+
+def make_cards(n):
+    rng = random.Random(1)
+    with open(BINS, newline="") as f:
+        rows = list(csv.DictReader(f))
+    year = datetime.now(timezone.utc).year
+    cards = []
+    for _ in range(n):
+        row = rng.choice(rows)
+        prefix = str(rng.randint(int(row["low"]), int(row["high"])))
+        if len(row["low"]) > len(prefix):
+            prefix = prefix.zfill(len(row["low"]))
+        length = 16 if "16" in row["lengths"] or "-" in row["lengths"] else int(row["lengths"].split()[0])
+        body = prefix + "".join(rng.choice("0123456789") for _ in range(length - len(prefix) - 1))
+        number = luhn_complete(body)
+        expiration = f"{rng.randint(1, 12):02d}/{(year + rng.randint(1, 5)) % 100:02d}"
+        cvv = "".join(rng.choice("0123456789") for _ in range(int(row["cvv_length"])))
+        fault = rng.random()
+        if fault < 0.08:
+            number = number[:-1] + str((int(number[-1]) + 1) % 10)   # checksum
+        elif fault < 0.14:
+            expiration = f"{rng.randint(1, 12):02d}/{(year - rng.randint(1, 5)) % 100:02d}"
+        elif fault < 0.20:
+            cvv = cvv[:-1]
+        elif fault < 0.25:
+            number = luhn_complete("9" + body[1:])                   # no such issuer
+        cards.append((number, expiration, cvv))
+    return cards
+
+
+def bench(validator, cards):
+    check = validator.check
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for number, expiration, cvv in cards:
+            check(number, expiration, cvv)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    cards = make_cards(CARDS)
+    tables = CardValidator(BinIndex.load(BINS))
+    naive = NaiveValidator(BINS)
+    expected = [tables.check(*card) for card in cards]
+    valid = sum(reason is None for reason in expected)
+    print(f"{CARDS} cards, {valid / CARDS:.0%} valid")
+    print(f"{'validator':<10}{'per card':>12}{'cards/s':>14}{'differ':>9}")
+    for name, validator, sample in (("tables", tables, cards), ("naive", naive, cards[:CARDS // 10])):
+        differ = sum(validator.check(*card) != reason for card, reason in zip(sample, expected))
+        elapsed = bench(validator, sample)
+        print(f"{name:<10}{elapsed / len(sample) * 1e9:>9.0f} ns{len(sample) / elapsed:>14,.0f}{differ:>9}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Measure what logging costs a checkout.
+
+  micro  (default) replays the orchestrator's log calls for one checkout
+         in-process, to /dev/null, under:
+           • before      basicConfig(DEBUG) + f-strings, full order dumped
+           • debug       utils/common/logs.py at DEBUG, LOG_SAMPLE_RATE=0.1
+           • info        utils/common/logs.py at INFO (the default)
+         and prints the cost per checkout in µs.
+
+  e2e    POSTs orders to a running orchestrator and prints p50/p99 latency.
+         Run it once per LOG_LEVEL the orchestrator was started with, e.g.
+           LOG_LEVEL=DEBUG docker compose up -d orchestrator
+           python bench_logging.py e2e debug
+           LOG_LEVEL=INFO docker compose up -d orchestrator
+           python bench_logging.py e2e info
+
+Usage: python bench_logging.py [micro|e2e] [label]
+"""
+
+import os, sys, time, uuid, logging, statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(__file__, '../../utils/common')))
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+ORCH_URL    = "http://localhost:8081/checkout"
+CHECKOUTS   = 20000     # micro: simulated checkouts per variant
+REQUESTS    = 300       # e2e: orders sent
+CONCURRENCY = 16
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def make_payload(i: int) -> dict:
+    return {
+        "order_id": str(uuid.uuid4()),
+        "user_id": f"user{i}",
+        "amount": 30,
+        "payment_method": "credit_card",
+        "user": {"name": f"User {i}", "contact": f"user{i}@example.com"},
+        "creditCard": {"number": "4111111111111111", "expirationDate": "12/30", "cvv": "123"},
+        "items": [{"name": "Book A", "quantity": 1}],
+        "billingAddress": {
+            "street": "100 Main St", "city": "Tartu", "state": "Tartu County",
+            "zip": "50090", "country": "Estonia"
+        },
+        "shippingMethod": "Standard",
+        "termsAccepted": True
+    }
+
+
+def checkout_logs_before(order, clock):
+    logging.debug(f"Incoming Request Data: {order}")
+    logging.debug(f"Function call_generate_suggestions(order_id = '{order['order_id']}', order_data = {order}, result_dict = {{}})")
+    for step in ("InitOrder", "CheckBooks", "CheckUserFields", "CheckCardFormat",
+                 "InitOrder", "CheckUserFraud", "CheckCardFraud"):
+        logging.debug(f"{step} updated clock: {clock}")
+    logging.debug(f"Final vector clock from Suggestions: {clock}")
+    logging.info(f"Order {order['order_id']} enqueued successfully.")
+
+
+def checkout_logs_after(order, clock):
+    order_id = order["order_id"]
+    logging.debug("Incoming order: %s", order, extra={"order_id": order_id})
+    for step in ("InitOrder", "CheckBooks", "CheckUserFields", "CheckCardFormat",
+                 "InitOrder", "CheckUserFraud", "CheckCardFraud"):
+        logging.debug("%s updated clock: %s", step, clock, extra={"order_id": order_id})
+    logging.debug("Final vector clock from Suggestions: %s", clock, extra={"order_id": order_id})
+    logging.info("Order %s enqueued successfully.", order_id)
+
+
+def micro():
+    from logs import setup_logging
+
+    orders = [make_payload(i) for i in range(CHECKOUTS)]
+    clock = {"fraud_detection": 3, "transaction_verification": 4, "suggestions": 1}
+    devnull = open(os.devnull, "w")
+    sys.stderr, real_stderr = devnull, sys.stderr   # the handlers write to stderr
+
+    def reset():
+        for handler in list(logging.getLogger().handlers):
+            logging.getLogger().removeHandler(handler)
+
+    results = {}
+    for label, setup, log in (
+        ("before", lambda: logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - [Orchestrator] %(message)s'),
+         checkout_logs_before),
+        ("debug", lambda: setup_logging("Orchestrator", "DEBUG"), checkout_logs_after),
+        ("info", lambda: setup_logging("Orchestrator", "INFO"), checkout_logs_after),
+    ):
+        reset()
+        listener = setup()
+        t0 = time.perf_counter()
+        for order in orders:
+            log(order, clock)
+        results[label] = (time.perf_counter() - t0) / CHECKOUTS * 1e6
+        if listener is not None:
+            listener.stop()   # drain, so the next variant starts clean
+
+    sys.stderr = real_stderr
+    print(f"⏱  logging cost per checkout, {CHECKOUTS} checkouts, time spent in the request thread\n")
+    for label, us in results.items():
+        print(f"{label:<8}{us:>10.1f} µs")
+
+
+def e2e(label):
+    import requests
+    session = requests.Session()
+
+    def send(i):
+        t0 = time.perf_counter()
+        status = session.post(ORCH_URL, json=make_payload(i), timeout=15).status_code
+        return (time.perf_counter() - t0) * 1000, status
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        results = list(pool.map(send, range(REQUESTS)))
+    latencies = sorted(ms for ms, _ in results)
+    errors = sum(1 for _, status in results if status != 200)
+    print(f"{label:<8} p50 {statistics.median(latencies):7.1f} ms   "
+          f"p99 {statistics.quantiles(latencies, n=100)[98]:7.1f} ms   errors {errors}")
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "micro"
+    if mode == "e2e":
+        e2e(sys.argv[2] if len(sys.argv) > 2 else "run")
+    else:
+        micro()
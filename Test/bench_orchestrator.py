@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compare throughput and tail latency of the Flask orchestrator (app.py) and
+the asyncio one (app_async.py) under the same closed-loop load.
+
+ • Each target gets a short warm-up, then REQUESTS orders from CONCURRENCY
+   client threads; every order is valid and uses its own book title.
+ • Prints requests/second, p50, p99, admission rejections (429/503) and
+   other errors per target.
+
+app.py rate-limits and caps concurrent checkouts, app_async.py doesn't; start
+the stack with the override that lifts those limits so both do the same work:
+  docker compose -f docker-compose.yaml -f Test/bench_orchestrator.compose.yaml up -d
+app.py still runs every order through its idempotency cache, one dict lookup
+and insert per order.
+
+Usage: python bench_orchestrator.py [requests] [concurrency]
+"""
+
+import sys, uuid, time, statistics
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+TARGETS = {
+    "flask": "http://localhost:8081/checkout",
+    "async": "http://localhost:8082/checkout",
+}
+REQUESTS    = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+WARMUP      = 20
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def make_payload(i: int) -> dict:
+    return {
+        "order_id": str(uuid.uuid4()),
+        "user_id": f"bench{i % 100}",
+        "amount": 20,
+        "payment_method": "credit_card",
+        "user": {"name": f"Bench {i}", "contact": f"bench{i}@example.com"},
+        "creditCard": {"number": "4111111111111111", "expirationDate": "12/30", "cvv": "123"},
+        "items": [{"name": f"Bench Book {i}", "quantity": 1}],
+        "billingAddress": {
+            "street": "100 Main St", "city": "Tartu", "state": "Tartu County",
+            "zip": "50090", "country": "Estonia"
+        },
+        "shippingMethod": "Standard",
+        "termsAccepted": True
+    }
+
+
+def run(url: str, count: int):
+    session = requests.Session()
+
+    def send(i):
+        t0 = time.perf_counter()
+        try:
+            status = session.post(url, json=make_payload(i), timeout=15).status_code
+        except requests.RequestException:
+            status = None
+        return (time.perf_counter() - t0) * 1000, status
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        results = list(pool.map(send, range(count)))
+    return time.perf_counter() - t0, results
+
+
+def main():
+    print(f"⏱  {REQUESTS} orders per target, {CONCURRENCY} concurrent clients\n")
+    print(f"{'target':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'shed':>8}{'errors':>8}")
+    for name, url in TARGETS.items():
+        run(url, WARMUP)
+        elapsed, results = run(url, REQUESTS)
+        latencies = sorted(ms for ms, _ in results)
+        shed = sum(1 for _, status in results if status in (429, 503))
+        errors = sum(1 for _, status in results if status not in (200, 429, 503))
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"{name:<8}{REQUESTS / elapsed:>10.1f}{statistics.median(latencies):>10.1f}"
+              f"{p99:>10.1f}{shed:>8}{errors:>8}")
+        if shed:
+            print(f"{'':<8}{name} shed load; was the stack started with Test/bench_orchestrator.compose.yaml?")
+
+
+if __name__ == "__main__":
+    main()
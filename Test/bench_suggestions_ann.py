@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare the suggestions service's IVF index with brute-force search.
+
+Builds a synthetic catalog of clustered, L2-normalised title embeddings
+(the shape suggestions/src/embeddings.py produces), saves it to a .npy file
+and opens it memory-mapped like the service does. Then, for a set of random
+query titles, reports per nprobe:
+  • recall@K   share of the exact top K that the IVF search also returns
+  • p50 / p99  query latency in µs, next to brute force over every title
+
+Usage: python bench_suggestions_ann.py [titles] [dimensions]
+"""
+
+import os, sys, time, tempfile, statistics
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(__file__, '../../suggestions/src')))
+from embeddings import BruteForceIndex, IVFIndex, normalize
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+TITLES     = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+DIMENSIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+GENRES     = 500        # clusters the synthetic titles are drawn around
+K          = 20
+QUERIES    = 500
+NPROBES    = [1, 4, 8, 16, 32]
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def synthetic_catalog(rng):
+    genres = normalize(rng.standard_normal((GENRES, DIMENSIONS)))
+    membership = rng.integers(0, GENRES, TITLES)
+    return normalize(genres[membership] + 1.5 * rng.standard_normal((TITLES, DIMENSIONS)) / np.sqrt(DIMENSIONS)
+                     ).astype(np.float32)
+
+
+def timed(search, queries):
+    results, latencies = [], []
+    for q in queries:
+        started = time.perf_counter()
+        ids, _ = search(q)
+        latencies.append((time.perf_counter() - started) * 1e6)
+        results.append(set(ids.tolist()))
+    latencies.sort()
+    return results, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main():
+    rng = np.random.default_rng(7)
+    path = os.path.join(tempfile.mkdtemp(), "embeddings.npy")
+    np.save(path, synthetic_catalog(rng))
+    vectors = np.load(path, mmap_mode="r")
+    queries = [np.array(vectors[i]) for i in rng.choice(TITLES, QUERIES, replace=False)]
+    print(f"{TITLES} titles × {DIMENSIONS} dimensions, top {K}, {QUERIES} queries")
+
+    exact, p50, p99 = timed(lambda q: BruteForceIndex(vectors).search(q, K), queries)
+    print(f"{'brute force':<14}{'recall 1.000':>14}{p50:>12.0f} µs p50{p99:>10.0f} µs p99")
+
+    started = time.perf_counter()
+    index = IVFIndex(vectors)
+    print(f"IVF build: {len(index.centroids)} lists in {time.perf_counter() - started:.1f} s")
+    for nprobe in NPROBES:
+        found, p50, p99 = timed(lambda q: index.search(q, K, nprobe), queries)
+        recall = statistics.mean(len(f & e) / K for f, e in zip(found, exact))
+        print(f"{'nprobe ' + str(nprobe):<14}{'recall ' + format(recall, '.3f'):>14}"
+              f"{p50:>12.0f} µs p50{p99:>10.0f} µs p99")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Show that the suggestions service's memory stays flat as orders go through.
+
+Calls SuggestionsService.GetSuggestions in-process with a new order_id per
+request and prints the process RSS every REPORT_EVERY requests for:
+  • unbounded  one vector clock kept per order forever (the old behaviour
+               once clocks are keyed by order id)
+  • bounded    the service as shipped: clocks in a ClockStore capped by
+               SUGGESTIONS_CLOCK_MAX_ORDERS / SUGGESTIONS_CLOCK_TTL_S
+
+Each variant runs in its own process so one can't inherit the other's heap.
+
+Usage: python bench_suggestions_memory.py [requests]
+"""
+
+import os, sys, time, uuid, logging, subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(__file__, '../../suggestions/src')))
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+REQUESTS     = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+REPORT_EVERY = 250000
+CARTS        = [["Book A"], ["Book B"], ["Book A", "Book C"], ["Book K"], ["Book D", "Book L"]]
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run(variant):
+    os.environ["LOG_LEVEL"] = "WARNING"
+    import app
+    logging.getLogger("opentelemetry").setLevel(logging.CRITICAL)  # no collector here
+
+    if variant == "unbounded":
+        clocks = {}
+
+        def increment_vc(order_id):
+            vc = clocks.setdefault(order_id, {})
+            vc[app.service_id] = vc.get(app.service_id, 0) + 1
+            return vc
+        app.increment_vc = increment_vc
+
+    service = app.SuggestionsService(app.SEED_BASKETS)
+    started = time.perf_counter()
+    print(f"{variant:<10} {0:>9} requests {rss_mb():8.1f} MB", flush=True)
+    for i in range(1, REQUESTS + 1):
+        request = app.suggestions_pb2.SuggestionRequest(
+            purchased_books=CARTS[i % len(CARTS)], order_id=uuid.uuid4().hex)
+        service.GetSuggestions(request, None)
+        if i % REPORT_EVERY == 0:
+            print(f"{variant:<10} {i:>9} requests {rss_mb():8.1f} MB", flush=True)
+    print(f"{variant:<10} {(time.perf_counter() - started) / REQUESTS * 1e6:.1f} µs per request\n", flush=True)
+
+
+def main():
+    if len(sys.argv) > 2:
+        run(sys.argv[2])
+        return
+    for variant in ("unbounded", "bounded"):
+        subprocess.run([sys.executable, __file__, str(REQUESTS), variant], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fraud service's velocity counters at a million active users.
+
+For each store, in its own process:
+  • ring     fraud_detection/src/velocity.py: per-key ring buffer of running
+             totals in shared NumPy arrays (the service's store)
+  • deque    one deque of (timestamp, amount) per key, summed per query
+             (the first version of the store)
+it records ORDERS orders within a 10 minute window, one per user plus the
+rest from a busy 1% of users, then prints
+  • memory   RSS growth while filling
+  • add      µs per recorded order
+  • window   µs per "orders/amount in the last N minutes" query, half of
+             them for busy users
+  • sweep    ms to scan every key, and to evict them all once idle
+
+Usage: python bench_velocity.py [users] [orders]
+"""
+
+import os, sys, time, random, subprocess
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(__file__, '../../fraud_detection/src')))
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+USERS   = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+ORDERS  = int(sys.argv[2]) if len(sys.argv) > 2 else 3000000
+QUERIES = 500000
+WINDOW  = 600           # seconds, as in rules.json
+BUCKET  = 60
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class DequeCounters:
+    def __init__(self, horizon):
+        self.horizon = horizon
+        self.events = {}
+
+    def add(self, key, amount, now):
+        events = self.events.get(key)
+        if events is None:
+            events = self.events[key] = deque()
+        events.append((now, amount))
+        while events[0][0] <= now - self.horizon:
+            events.popleft()
+
+    def window(self, key, seconds, now):
+        count, total = 0, 0.0
+        for timestamp, amount in reversed(self.events.get(key, ())):
+            if timestamp <= now - seconds:
+                break
+            count += 1
+            total += amount
+        return count, total
+
+    def sweep(self, now):
+        idle = [k for k, e in self.events.items() if e[-1][0] <= now - self.horizon]
+        for k in idle:
+            del self.events[k]
+        return len(idle)
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run(store):
+    if store == "ring":
+        from velocity import SlidingWindowCounters
+        counters = SlidingWindowCounters(horizon=WINDOW, bucket_s=BUCKET)
+    else:
+        counters = DequeCounters(WINDOW)
+
+    rng = random.Random(1)
+    keys = [f"user:user{i}" for i in range(USERS)]
+    start = 1_700_000_000.0
+    # Every user orders at least once; the rest come from a busy 1% of users.
+    hot = max(1, USERS // 100)
+    users = list(range(USERS)) + [rng.randrange(hot) for _ in range(ORDERS - USERS)]
+    amounts = [rng.uniform(5, 200) for _ in range(ORDERS)]
+    base = rss_mb()
+
+    started = time.perf_counter()
+    for n, (user, amount) in enumerate(zip(users, amounts)):
+        counters.add(keys[user], amount, start + n * WINDOW / ORDERS)
+    add_us = (time.perf_counter() - started) / ORDERS * 1e6
+    memory = rss_mb() - base
+    now = start + WINDOW
+
+    probes = [keys[rng.randrange(USERS) if n % 2 else rng.randrange(hot)] for n in range(QUERIES)]
+    started = time.perf_counter()
+    for key in probes:
+        counters.window(key, WINDOW, now)
+    window_us = (time.perf_counter() - started) / QUERIES * 1e6
+
+    started = time.perf_counter()
+    counters.sweep(now)
+    scan_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    evicted = counters.sweep(now + 2 * WINDOW)
+    evict_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{store:<6}{memory:>9.0f} MB{add_us:>9.2f} µs{window_us:>9.2f} µs"
+          f"{scan_ms:>10.0f} ms{evict_ms:>10.0f} ms  ({evicted} keys evicted)", flush=True)
+
+
+def main():
+    if len(sys.argv) > 3:
+        run(sys.argv[3])
+        return
+    print(f"{USERS} users, {ORDERS} orders in a {WINDOW} s window")
+    print(f"{'store':<6}{'memory':>12}{'add':>12}{'window':>12}{'scan':>13}{'evict':>13}")
+    for store in ("ring", "deque"):
+        subprocess.run([sys.executable, __file__, str(USERS), str(ORDERS), store], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,7 @@ def make_payload(i: int):
         "payment_method": "credit_card",
         "user": {"name": f"User {i}", "contact": f"user{i}@x.com"},
         "creditCard": {
-            "number": "4111111111111111", "expirationDate": "12/25", "cvv": "123"
+            "number": "4111111111111111", "expirationDate": "12/30", "cvv": "123"
         },
         "items": [ { "name": "Conflicted Book", "quantity": 1 } ],
         "billingAddress": {
@@ -39,7 +39,7 @@ def make_payload(i: int, fraud: bool) -> dict:
         },
         "creditCard": {
             "number": CARD_FRAUD if fraud else CARD_OK,
-            "expirationDate": "12/25",
+            "expirationDate": "12/30",
             "cvv": "123"
         },
         "items": [
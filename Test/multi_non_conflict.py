@@ -40,7 +40,7 @@ def make_payload(i: int) -> dict:
         },
         "creditCard": {
             "number": CARD_OK,
-            "expirationDate": "12/25",
+            "expirationDate": "12/30",
             "cvv": "123"
         },
         "items": [
@@ -4,6 +4,15 @@ import threading
 import time
 import os
 import sys
+import logging
+
+# OpenTelemetry imports
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 
 # Vector clock utils and gRPC stubs
 FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
@@ -17,19 +26,50 @@ import order_queue_pb2_grpc
 import books_database_pb2
 import books_database_pb2_grpc
 
+# Setup logging
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+from logs import setup_logging
+setup_logging("BooksDatabase")
+
+from channels import get_channel, server_options
+
+REPLICATION_TIMEOUT = float(os.getenv("REPLICATION_TIMEOUT", "2"))
+
+# Metrics setup
+resource = Resource(attributes={SERVICE_NAME: f"books_{os.getenv('ROLE', 'primary')}"})
+metric_exporter = OTLPMetricExporter(endpoint="http://observability:4318/v1/metrics")
+metric_reader = PeriodicExportingMetricReader(metric_exporter)
+metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+meter = metrics.get_meter(__name__)
+
+replication_counter = meter.create_counter(
+    "replication_writes", unit="1", description="Writes shipped to backups, by backup and outcome")
+replication_latency = meter.create_histogram(
+    "replication_rtt", unit="ms", description="Primary-observed round trip of ReplicateWrite per backup")
+apply_latency = meter.create_histogram(
+    "replication_apply_latency", unit="ms", description="Time a backup spends applying a replicated write")
+
 lock = threading.Lock()
 
+class BackupPeer:
+    def __init__(self, address):
+        self.address = address
+        self.stub = books_database_pb2_grpc.BooksDatabaseStub(get_channel(address))
+        self.acked_seq = 0
+
 class BooksDatabaseServicer(books_database_pb2_grpc.BooksDatabaseServicer):
     def __init__(self, role, backup_peers=None):
         self.db = {}  # key-value store
         self.lock = threading.Lock()
         self.role = role
-        self.backup_stubs = []
+        self.backups = []
+        self.seq = 0          # last sequence number assigned (primary) or applied (backup)
+        self.title_seq = {}   # backup: sequence number of the last write applied per title
         SEED_STOCK = {"Book A": 1,}
 
         for title, qty in SEED_STOCK.items():
             self.db[title] = qty
-            print(f"[bootstrap] {title} → {qty}")
+            logging.info("[bootstrap] %s → %s", title, qty)
 
 
         if role == "primary" and backup_peers:
@@ -38,45 +78,71 @@ class BooksDatabaseServicer(books_database_pb2_grpc.BooksDatabaseServicer):
                     continue  # skip empty entries
                 try:
                     host, port = peer.strip().split(":")
-                    channel = grpc.insecure_channel(f"{host}:{port}")
-                    stub = books_database_pb2_grpc.BooksDatabaseStub(channel)
-                    self.backup_stubs.append(stub)
-                    print(f"Connected to backup at {host}:{port}")
+                    self.backups.append(BackupPeer(f"{host}:{port}"))
+                    logging.info("Connected to backup at %s:%s", host, port)
                 except ValueError:
-                    print(f"Skipping malformed backup peer: '{peer}'")
+                    logging.warning("Skipping malformed backup peer: '%s'", peer)
+
+        meter.create_observable_gauge(
+            "replication_lag", callbacks=[self._observe_lag], unit="1",
+            description="Sequence numbers the backup is behind the primary")
+        meter.create_observable_counter(
+            "replication_seq", callbacks=[self._observe_seq], unit="1",
+            description="Last sequence number assigned (primary) or applied (backup)")
+
+    def _observe_lag(self, options):
+        return [Observation(self.seq - backup.acked_seq, {"backup": backup.address})
+                for backup in self.backups]
+
+    def _observe_seq(self, options):
+        return [Observation(self.seq, {"role": self.role})]
 
 
     # Common to both roles
     def Read(self, request, context):
         with self.lock:
             stock = self.db.get(request.title, 0)
-        print(f"🔎 Read stock for {request.title}: {stock}")
+        logging.debug("🔎 Read stock for %s: %s", request.title, stock)
         return books_database_pb2.ReadResponse(stock=stock)
 
     def DecrementStock(self, request, context):
-        with self.lock:                             
+        with self.lock:
             available = self.db.get(request.title, 0)
             if available >= request.quantity:
                 new_stock = available - request.quantity
                 self.db[request.title] = new_stock
-                print(f"{request.title}: decremented by {request.quantity} "
-                    f"(remaining={new_stock})")
-                return books_database_pb2.StockResponse(
-                    success=True, remaining=new_stock
-                )
+                seq = self._next_seq()
+                logging.debug("%s: decremented by %s (remaining=%s)", request.title, request.quantity, new_stock)
             else:
-                print(f"{request.title}: not enough stock (have {available})")
+                logging.info("%s: not enough stock (have %s)", request.title, available)
                 return books_database_pb2.StockResponse(
                     success=False, remaining=available
                 )
 
+        self.replicate(books_database_pb2.WriteRequest(
+            title=request.title, new_stock=new_stock, seq=seq
+        ))
+        return books_database_pb2.StockResponse(
+            success=True, remaining=new_stock
+        )
+
 
     # Backup only
     def ReplicateWrite(self, request, context):
+        start = time.perf_counter()
         with self.lock:
+            # Concurrent writes can reach a backup out of order; an older
+            # write must not overwrite a newer value for the same title.
+            if request.seq and request.seq <= self.title_seq.get(request.title, 0):
+                logging.info("Backup skipped stale write %s (seq %s)", request.title, request.seq)
+                return books_database_pb2.WriteResponse(success=True, applied_seq=self.seq)
             self.db[request.title] = request.new_stock
-            print(f"Backup wrote {request.title} → {request.new_stock}")
-        return books_database_pb2.WriteResponse(success=True)
+            self.title_seq[request.title] = request.seq
+            self.seq = max(self.seq, request.seq)
+            applied_seq = self.seq
+            logging.debug("Backup wrote %s → %s", request.title, request.new_stock)
+        apply_latency.record((time.perf_counter() - start) * 1000, {"role": self.role})
+        return books_database_pb2.WriteResponse(success=True, applied_seq=applied_seq)
 
     # Primary only
     def Write(self, request, context):
@@ -85,27 +151,44 @@ class BooksDatabaseServicer(books_database_pb2_grpc.BooksDatabaseServicer):
 
         with self.lock:
             self.db[request.title] = request.new_stock
-            print(f"Primary wrote {request.title} → {request.new_stock}")
-
-        for stub in self.backup_stubs:
+            seq = self._next_seq()
+            logging.debug("Primary wrote %s → %s", request.title, request.new_stock)
+
+        self.replicate(books_database_pb2.WriteRequest(
+            title=request.title, new_stock=request.new_stock, seq=seq
+        ))
+        return books_database_pb2.WriteResponse(success=True, applied_seq=seq)
+
+    def _next_seq(self):
+        # Caller holds self.lock so sequence order matches apply order.
+        self.seq += 1
+        return self.seq
+
+    def replicate(self, request):
+        for backup in self.backups:
+            start = time.perf_counter()
             try:
-                stub.ReplicateWrite(request)
-                print(f"Replicated {request.title} to backup")
+                response = backup.stub.ReplicateWrite(request, timeout=REPLICATION_TIMEOUT)
+                backup.acked_seq = max(backup.acked_seq, response.applied_seq)
+                replication_counter.add(1, {"backup": backup.address, "status": "ok"})
+                logging.debug("Replicated %s to backup %s (seq %s)", request.title, backup.address, request.seq)
             except Exception as e:
-                print(f"Replication failed: {e}")
-
-        return books_database_pb2.WriteResponse(success=True)
+                replication_counter.add(1, {"backup": backup.address, "status": "failed"})
+                logging.warning("Replication to %s failed: %s", backup.address, e)
+            replication_latency.record((time.perf_counter() - start) * 1000, {"backup": backup.address})
 
 def serve():
     role = os.getenv("ROLE", "primary")
-    backup_peers = os.getenv("BACKUP_PEERS", "").split(",") if role == "primary" else None
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    # docker-compose sets BACKUPS; BACKUP_PEERS is kept for older setups.
+    backups_env = os.getenv("BACKUPS") or os.getenv("BACKUP_PEERS", "")
+    backup_peers = backups_env.split(",") if role == "primary" else None
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=server_options())
     books_database_pb2_grpc.add_BooksDatabaseServicer_to_server(
         BooksDatabaseServicer(role, backup_peers), server
     )
     port = os.getenv("PORT", "50057")
     server.add_insecure_port(f"[::]:{port}")
-    print(f"BooksDatabase {role} running on port {port}...")
+    logging.info("BooksDatabase %s running on port %s...", role, port)
     server.start()
     server.wait_for_termination()
 
@@ -3,18 +3,84 @@ import os
 import grpc
 from concurrent import futures
 import threading
+import time
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - [FraudDetection] %(message)s')
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 
 FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
 fraud_detection_grpc_path = os.path.abspath(os.path.join(FILE, '../../../utils/pb/fraud_detection'))
 sys.path.insert(0, fraud_detection_grpc_path)
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+
+# Setup logging
+from logs import setup_logging
+setup_logging("FraudDetection")
+
+from channels import server_options
+from batching import LockedCalls, MicroBatcher
 
 import fraud_detection_pb2 as fraud_detection
 import fraud_detection_pb2_grpc as fraud_detection_pb2_grpc
 
+import model
+from rules import RuleEngine
+from velocity import SlidingWindowCounters
+
+# ----- Fraud rules -----
+# Loaded from FRAUD_RULES (rules.json next to this file by default) and
+# reloaded within FRAUD_RULES_RELOAD_S of the file changing; see rules.py
+# for the format. Per-rule evaluations, hits and time are exported as
+# fraud_rule_evaluations, fraud_rule_hits and fraud_rule_time.
+RULES_PATH = os.getenv("FRAUD_RULES", os.path.join(os.path.dirname(os.path.abspath(FILE)), "rules.json"))
+RULES_RELOAD_INTERVAL = float(os.getenv("FRAUD_RULES_RELOAD_S", "2"))
+# Velocity windows are counted in buckets of this many seconds.
+VELOCITY_BUCKET = float(os.getenv("FRAUD_VELOCITY_BUCKET_S", "60"))
+
+rule_engine = RuleEngine(RULES_PATH, SlidingWindowCounters(bucket_s=VELOCITY_BUCKET), min_horizon=model.WINDOW)
+
+resource = Resource(attributes={SERVICE_NAME: "fraud_detection"})
+metric_exporter = OTLPMetricExporter(endpoint="http://observability:4318/v1/metrics")
+metric_reader = PeriodicExportingMetricReader(metric_exporter)
+metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+meter = metrics.get_meter(__name__)
+
+def rule_stat(index):
+    def observe(options):
+        return [Observation(stats[index], {"rule": name}) for name, stats in list(rule_engine.stats.items())]
+    return observe
+
+meter.create_observable_counter("fraud_rule_evaluations", callbacks=[rule_stat(0)], unit="1",
+                                description="Times each fraud rule was evaluated")
+meter.create_observable_counter("fraud_rule_hits", callbacks=[rule_stat(1)], unit="1",
+                                description="Orders rejected by each fraud rule")
+meter.create_observable_counter("fraud_rule_time", callbacks=[rule_stat(2)], unit="ns",
+                                description="Time spent evaluating each fraud rule")
+
+# ----- Fraud model -----
+# With FRAUD_MODEL pointing at a file written by `python model.py`, orders
+# that pass the card rules are also scored by the model and rejected at or
+# above its threshold (FRAUD_MODEL_THRESHOLD overrides the trained one).
+# Scores are computed in batches of up to FRAUD_BATCH_MAX orders arriving
+# within FRAUD_BATCH_WAIT_MS of each other. If scoring fails, the rules'
+# decision stands.
+MODEL_PATH = os.getenv("FRAUD_MODEL")
+BATCH_MAX = int(os.getenv("FRAUD_BATCH_MAX", "256"))
+BATCH_WAIT = float(os.getenv("FRAUD_BATCH_WAIT_MS", "2")) / 1000
+MODEL_TIMEOUT = 1.0
+
+fraud_model = scorer = None
+if MODEL_PATH:
+    fraud_model = model.FraudModel.load(MODEL_PATH)
+    fraud_model.threshold = float(os.getenv("FRAUD_MODEL_THRESHOLD", fraud_model.threshold))
+    scorer = MicroBatcher(lambda rows: fraud_model.predict(rows).tolist(), BATCH_MAX, BATCH_WAIT, "fraud_model")
+    logging.info("Fraud model loaded from %s, threshold %.2f", MODEL_PATH, fraud_model.threshold)
+
 # In-memory store for order data and vector clocks
 order_data_store = {}
 vector_clocks = {}
@@ -32,71 +98,109 @@ def compare_vcs(local_vc, final_vc):
             return False
     return True
 
+# Handler bodies below run with `lock` held, through `locked`; with
+# RPC_BATCHING=1 concurrent requests share one acquisition (utils/common/batching.py).
+locked = LockedCalls(lock, name="fraud_detection")
+
+ORDER_NOT_FOUND = dict(is_success=False, message="Order not found", vector_clock={})
+
 class FraudDetectionService(fraud_detection_pb2_grpc.FraudServiceServicer):
     def InitOrder(self, request, context):
-        with lock:
-            order_data_store[request.order_id] = {
-                "user_id": request.user_id,
-                "amount": request.amount
-            }
-            vector_clocks[request.order_id] = {service_id: 1}
-            logging.debug(f"InitOrder updated VC for order {request.order_id}: {vector_clocks[request.order_id]}")
-            return fraud_detection.InitOrderResponse(
-                success=True,
-                message="Order initialized",
-                vector_clock=vector_clocks[request.order_id]
-            )
+        return locked(self.init_order, request)
 
     def CheckUserFraud(self, request, context):
-        with lock:
-            order = order_data_store.get(request.order_id)
-            if not order:
-                return fraud_detection.EventResponse(
-                    is_success=False,
-                    message="Order not found",
-                    vector_clock={}
-                )
-            vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
-            logging.debug(f"CheckUserFraud updated VC for order {request.order_id}: {vector_clocks[request.order_id]}")
-            return fraud_detection.EventResponse(
-                is_success=True,
-                message="User data not fraudulent",
-                vector_clock=vector_clocks[request.order_id]
-            )
+        return locked(self.check_user, request)
 
     def CheckCardFraud(self, request, context):
-        with lock:
-            order = order_data_store.get(request.order_id)
-            if not order:
-                return fraud_detection.EventResponse(
-                    is_success=False,
-                    message="Order not found",
-                    vector_clock={}
-                )
-            vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
-            is_fraud = order["amount"] > 1000
-            logging.debug(f"CheckCardFraud updated VC for order {request.order_id}: {vector_clocks[request.order_id]}")
-            logging.debug(f"CheckCardFraud FRAUD STATUS for order {request.order_id}: {'FRAUD' if is_fraud else 'OK'}")
-            return fraud_detection.EventResponse(
-                is_success=not is_fraud,
-                message="Fraudulent card" if is_fraud else "Card data clean",
+        checked = locked(self.check_card_rules, request)
+        if checked is None:
+            return fraud_detection.EventResponse(**ORDER_NOT_FOUND)
+        vc, hit, row = checked
+        if row is not None:
+            # Outside the lock: the scorer waits for other orders to batch with.
+            try:
+                score = scorer(row, MODEL_TIMEOUT)
+                if score >= fraud_model.threshold:
+                    hit = ("model", f"Fraud score {score:.2f}")
+            except Exception as e:
+                logging.warning("Fraud model scoring failed for order %s: %s", request.order_id, e)
+        logging.debug("CheckCardFraud updated VC for order %s: %s, rule %s", request.order_id, vc,
+                      hit[0] if hit else "none", extra={"order_id": request.order_id})
+        return fraud_detection.EventResponse(
+            is_success=hit is None,
+            message=hit[1] if hit else "Card data clean",
+            vector_clock=vc
+        )
+
+    def ClearOrder(self, request, context):
+        return locked(self.clear_order, request)
+
+    def init_order(self, request):
+        if request.order_id in order_data_store:
+            # A retried or hedged InitOrder whose first attempt got through;
+            # recording it again would count the order twice towards velocity.
+            return fraud_detection.InitOrderResponse(
+                success=True,
+                message="Order already initialized",
                 vector_clock=vector_clocks[request.order_id]
             )
+        order = order_data_store[request.order_id] = {
+            "user_id": request.user_id,
+            "user_type": request.user_type,
+            "card": request.card_fingerprint,
+            "amount": request.amount
+        }
+        rule_engine.record(order)
+        vector_clocks[request.order_id] = {service_id: 1}
+        logging.debug("InitOrder updated VC for order %s: %s", request.order_id, vector_clocks[request.order_id],
+                      extra={"order_id": request.order_id})
+        return fraud_detection.InitOrderResponse(
+            success=True,
+            message="Order initialized",
+            vector_clock=vector_clocks[request.order_id]
+        )
 
-    def ClearOrder(self, request, context):
-        with lock:
-            local_vc = vector_clocks.get(request.order_id, {})
-            if compare_vcs(local_vc, request.final_vector_clock):
-                order_data_store.pop(request.order_id, None)
-                vector_clocks.pop(request.order_id, None)
-                logging.debug(f"ClearOrder succeeded for order {request.order_id}")
-                return fraud_detection.ClearOrderResponse(status="Cleared")
-            else:
-                logging.debug(f"ClearOrder failed for order {request.order_id}. Local VC: {local_vc}, Final VC: {request.final_vector_clock}")
-                return fraud_detection.ClearOrderResponse(status="VC mismatch - not cleared")
+    def check_user(self, request):
+        order = order_data_store.get(request.order_id)
+        if not order:
+            return fraud_detection.EventResponse(**ORDER_NOT_FOUND)
+        vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
+        hit = rule_engine.evaluate("user", order)
+        logging.debug("CheckUserFraud updated VC for order %s: %s, rule %s", request.order_id,
+                      vector_clocks[request.order_id], hit[0] if hit else "none",
+                      extra={"order_id": request.order_id})
+        return fraud_detection.EventResponse(
+            is_success=hit is None,
+            message=hit[1] if hit else "User data not fraudulent",
+            vector_clock=vector_clocks[request.order_id]
+        )
+
+    def check_card_rules(self, request):
+        # Returns None for an unknown order, else (vector clock, rule hit,
+        # feature row to score or None).
+        order = order_data_store.get(request.order_id)
+        if not order:
+            return None
+        vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
+        hit = rule_engine.evaluate("card", order)
+        row = model.features(order, rule_engine.counters, time.time()) if scorer and not hit else None
+        return vector_clocks[request.order_id], hit, row
+
+    def clear_order(self, request):
+        local_vc = vector_clocks.get(request.order_id, {})
+        if compare_vcs(local_vc, request.final_vector_clock):
+            order_data_store.pop(request.order_id, None)
+            vector_clocks.pop(request.order_id, None)
+            logging.debug("ClearOrder succeeded for order %s", request.order_id, extra={"order_id": request.order_id})
+            return fraud_detection.ClearOrderResponse(status="Cleared")
+        else:
+            logging.debug("ClearOrder failed for order %s. Local VC: %s, Final VC: %s", request.order_id,
+                          local_vc, dict(request.final_vector_clock), extra={"order_id": request.order_id})
+            return fraud_detection.ClearOrderResponse(status="VC mismatch - not cleared")
 
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor())
+    rule_engine.watch(RULES_RELOAD_INTERVAL)
+    server = grpc.server(futures.ThreadPoolExecutor(), options=server_options())
     fraud_detection_pb2_grpc.add_FraudServiceServicer_to_server(FraudDetectionService(), server)
     server.add_insecure_port("[::]:50051")
     server.start()
@@ -0,0 +1,125 @@
+import json
+import math
+import sys
+
+import numpy as np
+
+from rules import card_fingerprint
+from velocity import SlidingWindowCounters
+
+# Logistic-regression fraud score.
+#
+# Trained offline from labelled past orders (python model.py history.jsonl
+# model.npz) and loaded by the service from FRAUD_MODEL. The features are
+# built from the same velocity counters the rules use; training replays the
+# history through a fresh set of counters so every order sees exactly what
+# the service would have seen when it arrived.
+#
+# predict() scores a whole matrix of orders at once; the service feeds it
+# through a MicroBatcher so concurrent orders share one call.
+
+WINDOW = 600  # seconds of velocity history the features look at
+USER_TYPES = ("premium", "business")
+FEATURES = (
+    "log_amount",
+    *(f"user_type_{t}" for t in USER_TYPES),
+    "log_user_orders",
+    "log_user_amount",
+    "amount_vs_user_average",
+    "log_card_orders",
+)
+
+def features(order, counters, now):
+    # order is the service's order dict (user_id, user_type, card, amount),
+    # already recorded in counters.
+    amount = order["amount"]
+    user_orders, user_amount = counters.window(f"user:{order['user_id']}", WINDOW, now)
+    card_orders, _ = counters.window(f"card:{order['card']}", WINDOW, now) if order["card"] else (0, 0.0)
+    average = user_amount / user_orders if user_orders else amount
+    return [
+        math.log1p(amount),
+        *(1.0 if order["user_type"] == t else 0.0 for t in USER_TYPES),
+        math.log1p(user_orders),
+        math.log1p(user_amount),
+        amount / average if average > 0 else 1.0,
+        math.log1p(card_orders),
+    ]
+
+class FraudModel:
+    def __init__(self, weights, bias, mean, scale, threshold=0.5):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.threshold = float(threshold)
+
+    def predict(self, rows):
+        # rows: (n, len(FEATURES)) array-like; returns n fraud probabilities.
+        x = (np.asarray(rows, dtype=np.float64) - self.mean) / self.scale
+        return 1 / (1 + np.exp(-(x @ self.weights + self.bias)))
+
+    def save(self, path):
+        np.savez(path, weights=self.weights, bias=self.bias, mean=self.mean, scale=self.scale,
+                 threshold=self.threshold, features=np.array(FEATURES))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        if tuple(data["features"].tolist()) != FEATURES:
+            raise ValueError(f"{path} was trained on features {data['features'].tolist()}, expected {list(FEATURES)}")
+        return cls(data["weights"], data["bias"], data["mean"], data["scale"], data["threshold"])
+
+def train(rows, labels, l2=1.0, iterations=25):
+    # Newton's method on the L2-regularised log-loss; a handful of features
+    # makes the Hessian tiny.
+    x = np.asarray(rows, dtype=np.float64)
+    y = np.asarray(labels, dtype=np.float64)
+    mean, scale = x.mean(axis=0), x.std(axis=0)
+    scale[scale == 0] = 1.0
+    x = np.hstack([(x - mean) / scale, np.ones((len(x), 1))])
+    w = np.zeros(x.shape[1])
+    penalty = np.eye(x.shape[1]) * l2
+    penalty[-1, -1] = 0  # leave the bias alone
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-(x @ w)))
+        gradient = x.T @ (p - y) + penalty @ w
+        hessian = (x * (p * (1 - p))[:, None]).T @ x + penalty
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < 1e-8:
+            break
+    return FraudModel(w[:-1], w[-1], mean, scale)
+
+def replay(history):
+    # history: dicts with timestamp, user_id, amount, fraud, and optionally
+    # user_type and card_number. Returns (feature rows, labels).
+    counters = SlidingWindowCounters(horizon=WINDOW)
+    rows, labels = [], []
+    for entry in sorted(history, key=lambda e: e["timestamp"]):
+        order = {
+            "user_id": str(entry["user_id"]),
+            "user_type": entry.get("user_type", ""),
+            "card": card_fingerprint(entry["card_number"]) if entry.get("card_number") else "",
+            "amount": float(entry["amount"]),
+        }
+        now = float(entry["timestamp"])
+        counters.add(f"user:{order['user_id']}", order["amount"], now)
+        if order["card"]:
+            counters.add(f"card:{order['card']}", order["amount"], now)
+        rows.append(features(order, counters, now))
+        labels.append(1.0 if entry["fraud"] else 0.0)
+    return rows, labels
+
+if __name__ == "__main__":
+    history_path, model_path = sys.argv[1], sys.argv[2]
+    with open(history_path) as f:
+        history = [json.loads(line) for line in f if line.strip()]
+    rows, labels = replay(history)
+    model = train(rows, labels)
+    predicted = model.predict(rows) >= model.threshold
+    actual = np.asarray(labels) == 1
+    precision = (predicted & actual).sum() / max(predicted.sum(), 1)
+    recall = (predicted & actual).sum() / max(actual.sum(), 1)
+    model.save(model_path)
+    print(f"Trained on {len(rows)} orders ({int(actual.sum())} fraudulent): "
+          f"precision {precision:.3f}, recall {recall:.3f} at threshold {model.threshold}")
@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(__file__, '../../../utils/common')))
+from fingerprints import card_fingerprint  # the orchestrator sends this instead of the card number
+
+# Configurable fraud rules.
+#
+# Rules are read from a JSON file, {"rules": [...]}, and evaluated in file
+# order; the first one that matches rejects the order. Every rule has a
+# unique "name" and a "type":
+#
+#   amount     "limits": {user_type: max amount, "default": ...}
+#   blocklist  "field": "user_id" or "card", "values": [...]; card values are
+#              fingerprints (utils/common/fingerprints.py), or use
+#              "card_numbers" to list plain numbers
+#   velocity   "key": "user" or "card", "window_s", and "max_orders" and/or
+#              "max_amount" over that window (the current order included);
+#              windows are counted in whole buckets, see velocity.py
+#
+# Optional on every rule: "stage" ("user" or "card") picks whether
+# CheckUserFraud or CheckCardFraud evaluates it (default: card for amount
+# rules and card keys, user otherwise), and "enabled": false skips it.
+#
+# Each rule is compiled once into a closure over its parameters, so an
+# evaluation is a few dict lookups and comparisons. The file is re-read when
+# its modification time changes; a file that fails to compile is logged and
+# the previous rules stay in force. Time spent in each rule is accumulated
+# per name and survives reloads.
+
+class RuleError(ValueError):
+    pass
+
+class _Rule:
+    __slots__ = ("name", "stage", "check", "stats")
+
+    def __init__(self, name, stage, check, stats):
+        self.name = name
+        self.stage = stage
+        self.check = check  # (order, counters, now) -> reason or None
+        self.stats = stats  # [evaluations, hits, total_ns, max_ns]
+
+# ----- Compilers -----
+# Orders are dicts with user_id, user_type, card (fingerprint) and amount.
+
+def _amount(spec):
+    limits = {str(user_type): float(limit) for user_type, limit in spec["limits"].items()}
+    default = limits.pop("default", float("inf"))
+    def check(order, counters, now):
+        limit = limits.get(order["user_type"], default)
+        if order["amount"] > limit:
+            return f"Amount {order['amount']:.2f} over the {limit:.2f} limit"
+    return check, "card"
+
+def _blocklist(spec):
+    field = spec["field"]
+    if field not in ("user_id", "card"):
+        raise RuleError(f"unknown blocklist field {field!r}")
+    values = frozenset(str(v) for v in spec.get("values", ()))
+    if field == "card":
+        values |= frozenset(card_fingerprint(n) for n in spec.get("card_numbers", ()))
+    label = "User" if field == "user_id" else "Card"
+    def check(order, counters, now):
+        if order[field] in values:
+            return f"{label} is blocklisted"
+    return check, "card" if field == "card" else "user"
+
+def _velocity(spec):
+    key = spec["key"]
+    if key not in ("user", "card"):
+        raise RuleError(f"unknown velocity key {key!r}")
+    field = "user_id" if key == "user" else "card"
+    seconds = float(spec["window_s"])
+    max_orders = spec.get("max_orders")
+    max_amount = spec.get("max_amount")
+    if max_orders is None and max_amount is None:
+        raise RuleError("velocity rule needs max_orders or max_amount")
+    max_orders = float("inf") if max_orders is None else int(max_orders)
+    max_amount = float("inf") if max_amount is None else float(max_amount)
+    label = f"{key.capitalize()} velocity"
+    def check(order, counters, now):
+        count, total = counters.window(f"{key}:{order[field]}", seconds, now)
+        if count > max_orders:
+            return f"{label}: {count} orders in {seconds:.0f} s"
+        if total > max_amount:
+            return f"{label}: {total:.2f} spent in {seconds:.0f} s"
+    return check, "card" if key == "card" else "user"
+
+_COMPILERS = {"amount": _amount, "blocklist": _blocklist, "velocity": _velocity}
+
+def compile_rules(specs, stats):
+    rules, names = [], set()
+    for n, spec in enumerate(specs):
+        name = spec.get("name") or f"rule{n}"
+        if name in names:
+            raise RuleError(f"duplicate rule name {name!r}")
+        names.add(name)
+        if not spec.get("enabled", True):
+            continue
+        compiler = _COMPILERS.get(spec.get("type"))
+        if compiler is None:
+            raise RuleError(f"{name}: unknown rule type {spec.get('type')!r}")
+        try:
+            check, stage = compiler(spec)
+        except (KeyError, TypeError, ValueError) as e:
+            raise RuleError(f"{name}: {e!r}") from e
+        stage = spec.get("stage", stage)
+        if stage not in ("user", "card"):
+            raise RuleError(f"{name}: unknown stage {stage!r}")
+        rules.append(_Rule(name, stage, check, stats.setdefault(name, [0, 0, 0, 0])))
+    return {stage: tuple(r for r in rules if r.stage == stage) for stage in ("user", "card")}
+
+# ----- Engine -----
+
+class RuleEngine:
+    def __init__(self, path, counters, min_horizon=60.0):
+        # min_horizon: seconds of velocity history kept even if no rule needs it.
+        self.path = path
+        self.counters = counters
+        self.min_horizon = min_horizon
+        self.stats = {}  # rule name -> [evaluations, hits, total_ns, max_ns]
+        self.mtime = None
+        self.rules = {"user": (), "card": ()}
+        self.load()
+
+    def load(self):
+        # Raises RuleError (or OSError) if the file can't be used.
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path) as f:
+            specs = json.load(f).get("rules", [])
+        self.rules = compile_rules(specs, self.stats)
+        # Counters only need to remember as far back as the longest window.
+        self.counters.set_horizon(max([float(spec["window_s"]) for spec in specs
+                                       if spec.get("type") == "velocity" and spec.get("enabled", True)]
+                                      + [self.min_horizon]))
+        self.mtime = mtime
+        logging.info("Loaded %d fraud rules from %s", sum(len(r) for r in self.rules.values()), self.path)
+
+    def watch(self, interval):
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    if os.stat(self.path).st_mtime != self.mtime:
+                        self.load()
+                except Exception as e:
+                    logging.error("Keeping previous fraud rules, %s failed to load: %s", self.path, e)
+                    self.mtime = os.stat(self.path).st_mtime if os.path.exists(self.path) else None
+                self.counters.sweep(time.time())
+        threading.Thread(target=loop, daemon=True).start()
+
+    def record(self, order, now=None):
+        now = time.time() if now is None else now
+        self.counters.add(f"user:{order['user_id']}", order["amount"], now)
+        if order["card"]:
+            self.counters.add(f"card:{order['card']}", order["amount"], now)
+
+    def evaluate(self, stage, order, now=None):
+        # Returns (rule name, reason) for the first matching rule, else None.
+        # Not thread-safe on its own: the service calls it under its lock.
+        now = time.time() if now is None else now
+        clock = time.perf_counter_ns
+        counters = self.counters
+        for rule in self.rules[stage]:
+            started = clock()
+            reason = rule.check(order, counters, now)
+            elapsed = clock() - started
+            stats = rule.stats
+            stats[0] += 1
+            stats[2] += elapsed
+            if elapsed > stats[3]:
+                stats[3] = elapsed
+            if reason:
+                stats[1] += 1
+                return rule.name, reason
+        return None
+
+    def profile(self):
+        # rule name -> (evaluations, hits, mean µs, max µs)
+        return {name: (calls, hits, total / calls / 1000 if calls else 0.0, worst / 1000)
+                for name, (calls, hits, total, worst) in self.stats.items()}
@@ -0,0 +1,138 @@
+import math
+import threading
+
+import numpy as np
+
+_FREE = np.iinfo(np.int64).max  # `last` of an unused row, so sweeps skip it
+
+class SlidingWindowCounters:
+    """Orders and amount per key over the last N seconds, in O(1) per call.
+
+    Time is cut into buckets of bucket_s seconds, and every key owns one row
+    of a shared ring buffer holding running totals (orders, amount) as of the
+    end of each of the last `buckets` buckets. A window's totals are then the
+    latest running total minus the one just before the window: two reads,
+    whatever the window length. Windows are rounded up to whole buckets.
+
+    Rows live in preallocated NumPy arrays, about 12 bytes per bucket per
+    key. sweep() frees the rows of keys with nothing left inside the horizon
+    for reuse.
+    """
+
+    def __init__(self, horizon=3600, bucket_s=60, capacity=1024):
+        self.bucket_s = float(bucket_s)
+        self.lock = threading.Lock()
+        self.buckets = self._buckets_for(horizon)
+        self.slots = {}  # key -> row
+        self.keys = [None] * capacity  # row -> key
+        self.free = list(range(capacity - 1, -1, -1))
+        self.last = np.full(capacity, _FREE, dtype=np.int64)  # bucket of each row's latest order
+        self.orders = np.zeros((capacity, self.buckets), dtype=np.int32)
+        self.amounts = np.zeros((capacity, self.buckets), dtype=np.float64)
+
+    def _buckets_for(self, horizon):
+        return math.ceil(horizon / self.bucket_s) + 1
+
+    def set_horizon(self, horizon):
+        # Resizes the ring buffers, keeping as much recent history as fits.
+        buckets = self._buckets_for(horizon)
+        with self.lock:
+            if buckets == self.buckets:
+                return
+            keep = min(buckets, self.buckets)
+            rows = np.arange(len(self.last))
+            orders = np.zeros((len(self.last), buckets), dtype=np.int32)
+            amounts = np.zeros((len(self.last), buckets), dtype=np.float64)
+            for back in range(keep):
+                epochs = self.last - back
+                orders[rows, epochs % buckets] = self.orders[rows, epochs % self.buckets]
+                amounts[rows, epochs % buckets] = self.amounts[rows, epochs % self.buckets]
+            # Buckets older than the history we had get the oldest running
+            # total we know, so windows reaching into them count only that
+            # history instead of subtracting 0 (a key's lifetime totals).
+            oldest = (self.last - (keep - 1)) % buckets
+            for back in range(keep, buckets):
+                epochs = self.last - back
+                orders[rows, epochs % buckets] = orders[rows, oldest]
+                amounts[rows, epochs % buckets] = amounts[rows, oldest]
+            self.orders, self.amounts, self.buckets = orders, amounts, buckets
+
+    @property
+    def horizon(self):
+        return (self.buckets - 1) * self.bucket_s
+
+    def add(self, key, amount, now):
+        epoch = int(now // self.bucket_s)
+        with self.lock:
+            buckets = self.buckets
+            slot = self.slots.get(key)
+            if slot is None:
+                slot = self._allocate(key)
+                self.last[slot] = epoch
+                self.orders[slot] = 0
+                self.amounts[slot] = 0.0
+            else:
+                last = self.last.item(slot)
+                if epoch > last:
+                    # Carry the running totals into the buckets that had no orders.
+                    orders, amounts = self.orders[slot], self.amounts[slot]
+                    count, total = orders.item(last % buckets), amounts.item(last % buckets)
+                    if epoch - last >= buckets:
+                        orders[:] = count
+                        amounts[:] = total
+                    else:
+                        for skipped in range(last + 1, epoch + 1):
+                            orders[skipped % buckets] = count
+                            amounts[skipped % buckets] = total
+                    self.last[slot] = epoch
+                else:
+                    epoch = last  # clock stepped back; count it in the latest bucket
+            position = epoch % buckets
+            self.orders[slot, position] += 1
+            self.amounts[slot, position] += amount
+
+    def window(self, key, seconds, now):
+        # Returns (orders, total amount) for key within the last `seconds`.
+        epoch = int(now // self.bucket_s)
+        with self.lock:
+            slot = self.slots.get(key)
+            if slot is None:
+                return 0, 0.0
+            buckets = self.buckets
+            last = self.last.item(slot)
+            before = max(epoch, last) - min(math.ceil(seconds / self.bucket_s), buckets - 1)
+            if before >= last:
+                return 0, 0.0
+            end, start = last % buckets, before % buckets
+            orders, amounts = self.orders, self.amounts
+            return (orders.item(slot, end) - orders.item(slot, start),
+                    amounts.item(slot, end) - amounts.item(slot, start))
+
+    def sweep(self, now):
+        # Frees keys whose latest order is older than the horizon.
+        epoch = int(now // self.bucket_s)
+        with self.lock:
+            idle = np.flatnonzero(self.last < epoch - (self.buckets - 1))
+            for slot in idle.tolist():
+                del self.slots[self.keys[slot]]
+                self.keys[slot] = None
+                self.free.append(slot)
+            self.last[idle] = _FREE
+            return len(idle)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _allocate(self, key):
+        # Caller holds self.lock.
+        if not self.free:
+            capacity = len(self.last)
+            self.last = np.concatenate([self.last, np.full(capacity, _FREE, dtype=np.int64)])
+            self.orders = np.concatenate([self.orders, np.zeros_like(self.orders)])
+            self.amounts = np.concatenate([self.amounts, np.zeros_like(self.amounts)])
+            self.keys.extend([None] * capacity)
+            self.free = list(range(2 * capacity - 1, capacity - 1, -1))
+        slot = self.free.pop()
+        self.slots[key] = slot
+        self.keys[slot] = key
+        return slot
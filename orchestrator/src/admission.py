@@ -0,0 +1,203 @@
+import logging
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+
+meter = metrics.get_meter(__name__)
+rejection_counter = meter.create_counter(
+    "admission_rejections", unit="1", description="Checkouts turned away before any RPC, by reason")
+
+# ----- Token buckets -----
+
+class _Shard:
+    def __init__(self, max_keys):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()  # key -> [tokens, last_refill]
+        self.max_keys = max_keys
+
+class LocalBucketStore:
+    """Token buckets kept in this process, sharded by key to keep lock contention low.
+
+    Each shard evicts its least recently used keys beyond max_keys; an evicted
+    user simply starts again with a full bucket.
+    """
+
+    def __init__(self, rate, burst, shards=16, max_keys=100000):
+        self.rate = rate
+        self.burst = burst
+        self.shards = [_Shard(max(1, max_keys // shards)) for _ in range(shards)]
+
+    def try_acquire(self, key, cost=1):
+        # Returns 0 if the tokens were taken, else seconds until they would be.
+        shard = self.shards[zlib.crc32(key.encode()) % len(self.shards)]
+        now = time.monotonic()
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = shard.buckets[key] = [self.burst, now]
+                if len(shard.buckets) > shard.max_keys:
+                    shard.buckets.popitem(last=False)
+            else:
+                shard.buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0
+            return (cost - bucket[0]) / self.rate
+
+    def refund(self, key, cost=1):
+        # Gives back tokens taken by try_acquire for a request that was then
+        # turned away elsewhere.
+        shard = self.shards[zlib.crc32(key.encode()) % len(self.shards)]
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + cost)
+
+# Refill and take in one round trip. Redis' clock is used so that every
+# orchestrator replica agrees on elapsed time.
+_REDIS_TAKE = """
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens, ts = tonumber(state[1]), tonumber(state[2])
+if tokens == nil then tokens, ts = burst, now end
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local wait = 0
+if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+_REDIS_REFUND = """
+local burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens ~= nil then redis.call('HSET', KEYS[1], 'tokens', math.min(burst, tokens + cost)) end
+"""
+
+class RedisBucketStore:
+    """Token buckets shared by all orchestrator replicas through Redis.
+
+    If Redis can't be reached, calls fall back to a local store, so a Redis
+    outage loosens the limit to per-replica instead of blocking checkouts.
+    """
+
+    def __init__(self, url, rate, burst, prefix):
+        import redis  # only needed when a shared backend is configured
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self.take = self.client.register_script(_REDIS_TAKE)
+        self.give_back = self.client.register_script(_REDIS_REFUND)
+        self.rate = rate
+        self.burst = burst
+        self.prefix = prefix
+        self.fallback = LocalBucketStore(rate, burst)
+
+    def try_acquire(self, key, cost=1):
+        try:
+            return float(self.take(keys=[self.prefix + key], args=[self.rate, self.burst, cost]))
+        except Exception as e:
+            logging.warning("Rate limiter backend unavailable, using local buckets: %s", e)
+            return self.fallback.try_acquire(key, cost)
+
+    def refund(self, key, cost=1):
+        try:
+            self.give_back(keys=[self.prefix + key], args=[self.burst, cost])
+        except Exception as e:
+            logging.warning("Rate limiter backend unavailable, using local buckets: %s", e)
+            self.fallback.refund(key, cost)
+
+def bucket_store(rate, burst, redis_url=None, prefix="ratelimit:"):
+    if redis_url:
+        return RedisBucketStore(redis_url, rate, burst, prefix)
+    return LocalBucketStore(rate, burst)
+
+class RateLimiter:
+    def __init__(self, per_user, global_store):
+        self.per_user = per_user
+        self.global_store = global_store
+
+    def check(self, user_id):
+        # Returns None if admitted, else (reason, retry_after seconds). The
+        # user's own bucket is checked first so a flooding user can't drain
+        # the global one. A user whose request the global bucket turns away
+        # gets their token back, so a busy system doesn't also use up their
+        # own allowance.
+        user_key = f"user:{user_id or 'anonymous'}"
+        wait = self.per_user.try_acquire(user_key)
+        if wait:
+            rejection_counter.add(1, {"reason": "user_rate"})
+            return "user_rate", wait
+        wait = self.global_store.try_acquire("global")
+        if wait:
+            self.per_user.refund(user_key)
+            rejection_counter.add(1, {"reason": "global_rate"})
+            return "global_rate", wait
+        return None
+
+# ----- Adaptive concurrency -----
+
+class AdaptiveConcurrencyLimiter:
+    """Caps checkouts in flight, adjusting the cap from observed latency.
+
+    A short and a long moving average of checkout latency are compared: when
+    recent latency rises above the long-run baseline (times tolerance), the
+    downstream services are queueing and the limit shrinks in proportion;
+    otherwise it grows by about sqrt(limit) per sample. Requests over the
+    limit are rejected immediately rather than queued.
+    """
+
+    def __init__(self, initial=20, min_limit=4, max_limit=200, tolerance=1.5, smoothing=0.2):
+        self.lock = threading.Lock()
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.short_rtt = None
+        self.long_rtt = None
+        meter.create_observable_gauge(
+            "admission_concurrency_limit", callbacks=[self._observe], unit="1",
+            description="Current adaptive limit on checkouts in flight")
+
+    def try_acquire(self):
+        with self.lock:
+            if self.in_flight >= int(self.limit):
+                rejection_counter.add(1, {"reason": "concurrency"})
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency, sample=True):
+        # sample=False for outcomes that say nothing about downstream load,
+        # e.g. a validation error.
+        with self.lock:
+            self.in_flight -= 1
+            if not sample:
+                return
+            if self.long_rtt is None:
+                self.short_rtt = self.long_rtt = latency
+                return
+            self.short_rtt += (latency - self.short_rtt) * 0.1
+            self.long_rtt += (latency - self.long_rtt) * 0.01
+            gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+            if gradient == 1.0 and self.in_flight < self.limit / 2:
+                return  # not using the limit we have; no reason to raise it
+            new_limit = self.limit * gradient + math.sqrt(self.limit)
+            self.limit = max(self.min_limit, min(self.max_limit,
+                             self.limit * (1 - self.smoothing) + new_limit * self.smoothing))
+            if self.long_rtt > self.short_rtt * 2:
+                # Load has dropped a lot; let the baseline catch up faster.
+                self.long_rtt = self.short_rtt * 2
+
+    def _observe(self, options):
+        yield Observation(self.limit)
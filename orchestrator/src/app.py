@@ -1,9 +1,14 @@
 import sys
 import os
+import json
+import hashlib
+import math
+import time
 import threading
 import grpc
 import logging
-from flask import Flask, request, jsonify
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 
 # OpenTelemetry imports
@@ -32,9 +37,9 @@ meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader]
 metrics.set_meter_provider(meter_provider)
 meter = metrics.get_meter(__name__)
 order_counter = meter.create_counter("orders_processed", unit="1", description="Number of orders processed")
+invalid_order_counter = meter.create_counter("orders_invalid", unit="1", description="Orders rejected by request validation, by field")
+idempotency_counter = meter.create_counter("checkout_idempotency", unit="1", description="Checkout requests by idempotency outcome")
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - [Orchestrator] %(message)s')
 
 # Setup gRPC stub paths
 FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
@@ -47,6 +52,14 @@ sys.path.insert(0, fraud_detection_grpc_path)
 sys.path.insert(0, transaction_verification_grpc_path)
 sys.path.insert(0, suggestions_grpc_path)
 sys.path.insert(0, order_queue_grpc_path)
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+
+# Setup logging
+from logs import setup_logging
+setup_logging("Orchestrator")
+
+from channels import get_channel
+from fingerprints import card_fingerprint
 
 # Import gRPC stubs
 import fraud_detection_pb2 as fraud_detection
@@ -58,18 +71,155 @@ import suggestions_pb2_grpc as suggestions_pb2_grpc
 import order_queue_pb2
 import order_queue_pb2_grpc
 
+from admission import AdaptiveConcurrencyLimiter, RateLimiter, bucket_store
+from cache import IdempotencyConflict, SingleFlightCache, TTLCache
+from resilience import MethodPolicy, ResilientStub, RetryBudget
+from validation import validate_order
+
 # Flask app
 app = Flask(__name__)
 CORS(app, resources={r'/*': {'origins': '*'}})
 
 # gRPC service connections
-fraud_stub = fraud_detection_pb2_grpc.FraudServiceStub(grpc.insecure_channel('fraud_detection:50051'))
-transaction_stub = transaction_pb2_grpc.TransactionVerificationServiceStub(grpc.insecure_channel('transaction_verification:50052'))
-suggestions_stub = suggestions_pb2_grpc.SuggestionsServiceStub(grpc.insecure_channel('suggestions:50053'))
-order_queue_stub = order_queue_pb2_grpc.OrderQueueServiceStub(grpc.insecure_channel("order_queue:50056"))
+# Every call gets a deadline. Only InitOrder is retried on transient errors,
+# within one retry budget shared by all stubs: both check services ignore an
+# InitOrder for an order they already hold. The Check* events and
+# GetSuggestions advance the order's vector clock, so a repeat that reached
+# the server would apply the event twice; they are neither retried nor
+# hedged, and neither is Enqueue.
+# Channels come from the shared pool in utils/common/channels.py. The two
+# check services get several connections each, since every checkout makes
+# four sequential calls to each of them.
+CHECK_SUBCHANNELS = int(os.getenv("CHECK_SUBCHANNELS", "2"))
+retry_budget = RetryBudget(ratio=0.1)
+CHECK_POLICY = MethodPolicy(timeout=1.0)
+CHECK_POLICIES = {"InitOrder": MethodPolicy(timeout=1.0, retries=2)}
+
+fraud_stub = ResilientStub(
+    fraud_detection_pb2_grpc.FraudServiceStub(get_channel('fraud_detection:50051', subchannels=CHECK_SUBCHANNELS)),
+    "fraud_detection", CHECK_POLICIES, default=CHECK_POLICY, budget=retry_budget)
+transaction_stub = ResilientStub(
+    transaction_pb2_grpc.TransactionVerificationServiceStub(get_channel('transaction_verification:50052', subchannels=CHECK_SUBCHANNELS)),
+    "transaction_verification", CHECK_POLICIES, default=CHECK_POLICY, budget=retry_budget)
+suggestions_stub = ResilientStub(
+    suggestions_pb2_grpc.SuggestionsServiceStub(get_channel('suggestions:50053')),
+    "suggestions", default=MethodPolicy(timeout=0.5), budget=retry_budget)
+order_queue_stub = ResilientStub(
+    order_queue_pb2_grpc.OrderQueueServiceStub(get_channel("order_queue:50056")),
+    "order_queue", default=MethodPolicy(timeout=2.0), budget=retry_budget)
+
+# ----- Suggestions latency budget -----
+# "blocking" waits for suggestions before answering. "budgeted" waits at most
+# SUGGESTIONS_BUDGET_MS once the checks have passed, then answers with the
+# suggestions last seen for the same cart. The late result can be fetched
+# afterwards from GET /suggestions/<order_id>.
+SUGGESTIONS_MODE = os.getenv("SUGGESTIONS_MODE", "blocking")
+SUGGESTIONS_BUDGET = float(os.getenv("SUGGESTIONS_BUDGET_MS", "50")) / 1000
+SUGGESTIONS_PENDING = object()
+
+suggestions_by_order = TTLCache(max_size=10000, ttl=600)
+suggestions_by_cart = TTLCache(max_size=1000, ttl=300)
+
+def cart_key(order):
+    return tuple(sorted(item["name"] for item in order.get("items", [])))
+
+# ----- Idempotent checkout -----
+# Clients retry /checkout on timeouts. Requests for an order_id already being
+# processed wait for that run instead of starting their own, and the outcome
+# is replayed for IDEMPOTENCY_TTL seconds afterwards. 5xx outcomes are not
+# cached, so a retry after a failed enqueue runs again; neither are 429s.
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "600"))
+checkout_results = SingleFlightCache(max_size=10000, ttl=IDEMPOTENCY_TTL)
+
+def order_fingerprint(order):
+    return hashlib.sha256(json.dumps(order, sort_keys=True).encode()).hexdigest()
+
+# ----- Admission control -----
+# Token buckets per user_id and for the whole orchestrator, kept in process
+# or, with RATE_LIMIT_REDIS_URL, shared by all replicas through Redis. On top
+# of that, an adaptive cap on checkouts in flight that shrinks when checkout
+# latency rises. Over-rate requests get 429, over-capacity ones 503, both
+# with Retry-After and before any RPC is sent.
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+rate_limiter = RateLimiter(
+    per_user=bucket_store(float(os.getenv("RATE_LIMIT_USER_RPS", "10")),
+                          float(os.getenv("RATE_LIMIT_USER_BURST", "20")), RATE_LIMIT_REDIS_URL),
+    global_store=bucket_store(float(os.getenv("RATE_LIMIT_GLOBAL_RPS", "500")),
+                              float(os.getenv("RATE_LIMIT_GLOBAL_BURST", "1000")), RATE_LIMIT_REDIS_URL),
+)
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    initial=int(os.getenv("CONCURRENCY_LIMIT_INITIAL", "20")),
+    min_limit=int(os.getenv("CONCURRENCY_LIMIT_MIN", "4")),
+    max_limit=int(os.getenv("CONCURRENCY_LIMIT_MAX", "200")),
+)
+
+def admit_and_process(order):
+    limited = rate_limiter.check(order["user_id"])
+    if limited is not None:
+        reason, wait = limited
+        message = "Too many orders from this user" if reason == "user_rate" else "Too many orders, try again shortly"
+        return {"status": "rejected", "reason": message, "retryAfter": math.ceil(wait)}, 429
+    if not concurrency_limiter.try_acquire():
+        return {"status": "rejected", "reason": "Checkout is overloaded, try again shortly", "retryAfter": 1}, 503
+    start = time.perf_counter()
+    try:
+        result = process_order(order)
+    except BaseException:
+        # A bug here, not a measure of downstream latency.
+        concurrency_limiter.release(time.perf_counter() - start, sample=False)
+        raise
+    # A 400 is a check rejecting the order, often as soon as the first check
+    # fails with the others cancelled, so its latency says little about load.
+    concurrency_limiter.release(time.perf_counter() - start, sample=result[1] != 400)
+    return result
+
+# ----- In-flight checkout tracking -----
+class CheckoutCancelled(Exception):
+    pass
+
+class CheckoutCall:
+    """Tracks the RPCs of one checkout so the first failed check can cancel the rest."""
+
+    def __init__(self, checks):
+        self.lock = threading.Lock()
+        self.calls = set()
+        self.cancelled = False
+        self.rejection = None
+        self.pending = set(checks)
+        self.finished = threading.Event()
+
+    def call(self, method, request):
+        with self.lock:
+            if self.cancelled:
+                raise CheckoutCancelled()
+            future = method.future(request)
+            self.calls.add(future)
+        try:
+            return future.result()
+        except grpc.FutureCancelledError:
+            raise CheckoutCancelled()
+        finally:
+            with self.lock:
+                self.calls.discard(future)
+
+    def reject(self, reason):
+        with self.lock:
+            if self.rejection is None:
+                self.rejection = reason
+            self.cancelled = True
+            calls = list(self.calls)
+        for future in calls:
+            future.cancel()
+        self.finished.set()
+
+    def passed(self, check):
+        with self.lock:
+            self.pending.discard(check)
+            if not self.pending:
+                self.finished.set()
 
 # ----- Transaction Verification Handler -----
-def transaction_event_flow(order, result_holder, event):
+def transaction_event_flow(order, checkout_call):
     with tracer.start_as_current_span("transaction_event_flow"):
         try:
             order_id = order["order_id"]
@@ -79,145 +229,241 @@ def transaction_event_flow(order, result_holder, event):
                 "address": order["billingAddress"]["street"]
             }
             books = [item["name"] for item in order.get("items", [])]
-            credit_card = str(order["creditCard"]["number"]).replace(" ", "").replace("-", "")
+            card = order["creditCard"]
+            credit_card = str(card["number"]).replace(" ", "").replace("-", "")
 
-            init_response = transaction_stub.InitOrder(transaction_pb2.InitOrderRequest(
+            init_response = checkout_call.call(transaction_stub.InitOrder, transaction_pb2.InitOrderRequest(
                 order_id=order_id,
                 user_data=user_data,
                 books=books,
-                credit_card=credit_card
+                credit_card=credit_card,
+                expiration_date=str(card.get("expirationDate", "")).replace(" ", ""),
+                cvv=str(card.get("cvv", "")).strip()
             ))
-            logging.debug(f"InitOrder updated clock: {init_response.vector_clock}")
+            logging.debug("InitOrder updated clock: %s", init_response.vector_clock, extra={"order_id": order_id})
 
             if not init_response.success:
-                result_holder["transaction"] = (False, init_response.message)
-                event.set()
+                checkout_call.reject(init_response.message)
                 return
 
-            books_resp = transaction_stub.CheckBooks(transaction_pb2.EventRequest(order_id=order_id))
-            logging.debug(f"CheckBooks updated clock: {books_resp.vector_clock}")
+            books_resp = checkout_call.call(transaction_stub.CheckBooks, transaction_pb2.EventRequest(order_id=order_id))
+            logging.debug("CheckBooks updated clock: %s", books_resp.vector_clock, extra={"order_id": order_id})
             if not books_resp.is_success:
-                result_holder["transaction"] = (False, books_resp.message)
-                event.set()
+                checkout_call.reject(books_resp.message)
                 return
 
-            user_resp = transaction_stub.CheckUserFields(transaction_pb2.EventRequest(order_id=order_id))
-            logging.debug(f"CheckUserFields updated clock: {user_resp.vector_clock}")
+            user_resp = checkout_call.call(transaction_stub.CheckUserFields, transaction_pb2.EventRequest(order_id=order_id))
+            logging.debug("CheckUserFields updated clock: %s", user_resp.vector_clock, extra={"order_id": order_id})
             if not user_resp.is_success:
-                result_holder["transaction"] = (False, user_resp.message)
-                event.set()
+                checkout_call.reject(user_resp.message)
                 return
 
-            card_resp = transaction_stub.CheckCardFormat(transaction_pb2.EventRequest(order_id=order_id))
-            logging.debug(f"CheckCardFormat updated clock: {card_resp.vector_clock}")
+            card_resp = checkout_call.call(transaction_stub.CheckCardFormat, transaction_pb2.EventRequest(order_id=order_id))
+            logging.debug("CheckCardFormat updated clock: %s", card_resp.vector_clock, extra={"order_id": order_id})
             if not card_resp.is_success:
-                result_holder["transaction"] = (False, card_resp.message)
-                event.set()
+                checkout_call.reject(card_resp.message)
                 return
 
-            result_holder["transaction"] = (True, "Transaction Valid")
-            event.set()
+            checkout_call.passed("transaction")
 
+        except CheckoutCancelled:
+            logging.debug("transaction_event_flow cancelled after another check failed")
         except Exception as e:
-            logging.error(f"transaction_event_flow failed: {str(e)}")
-            result_holder["transaction"] = (False, "Transaction service encountered an internal error")
-            event.set()
+            logging.error("transaction_event_flow failed: %s", e)
+            checkout_call.reject("Transaction service encountered an internal error")
 
 # ----- Fraud Detection Handler -----
-def fraud_event_flow(order, result_holder, event):
+def fraud_event_flow(order, checkout_call):
     with tracer.start_as_current_span("fraud_event_flow"):
         try:
             order_id = order["order_id"]
             user_id = order["user_id"]
             amount = order["amount"]
 
-            init_response = fraud_stub.InitOrder(fraud_detection.InitOrderRequest(
+            init_response = checkout_call.call(fraud_stub.InitOrder, fraud_detection.InitOrderRequest(
                 order_id=order_id,
                 user_id=user_id,
-                amount=amount
+                amount=amount,
+                user_type=order["user"].get("type", ""),
+                card_fingerprint=card_fingerprint(order["creditCard"]["number"])
             ))
-            logging.debug(f"InitOrder updated clock: {init_response.vector_clock}")
+            logging.debug("InitOrder updated clock: %s", init_response.vector_clock, extra={"order_id": order_id})
 
             if not init_response.success:
-                result_holder["fraudulent"] = True
-                event.set()
+                checkout_call.reject("Fraud detected")
                 return
 
-            user_resp = fraud_stub.CheckUserFraud(fraud_detection.EventRequest(order_id=order_id))
-            logging.debug(f"CheckUserFraud updated clock: {user_resp.vector_clock}")
+            user_resp = checkout_call.call(fraud_stub.CheckUserFraud, fraud_detection.EventRequest(order_id=order_id))
+            logging.debug("CheckUserFraud updated clock: %s", user_resp.vector_clock, extra={"order_id": order_id})
             if not user_resp.is_success:
-                result_holder["fraudulent"] = True
-                event.set()
+                checkout_call.reject("Fraud detected")
                 return
 
-            card_resp = fraud_stub.CheckCardFraud(fraud_detection.EventRequest(order_id=order_id))
-            logging.debug(f"CheckCardFraud updated clock: {card_resp.vector_clock}")
+            card_resp = checkout_call.call(fraud_stub.CheckCardFraud, fraud_detection.EventRequest(order_id=order_id))
+            logging.debug("CheckCardFraud updated clock: %s", card_resp.vector_clock, extra={"order_id": order_id})
             if not card_resp.is_success:
-                result_holder["fraudulent"] = True
-                event.set()
+                checkout_call.reject("Fraud detected")
                 return
 
-            result_holder["fraudulent"] = False
-            event.set()
+            checkout_call.passed("fraud")
 
+        except CheckoutCancelled:
+            logging.debug("fraud_event_flow cancelled after another check failed")
         except Exception as e:
-            logging.error(f"fraud_event_flow failed: {str(e)}")
-            result_holder["fraudulent"] = True
-            event.set()
+            logging.error("fraud_event_flow failed: %s", e)
+            checkout_call.reject("Fraud detected")
 
 # ----- Book Suggestions -----
-def get_suggestions(order, result_holder, event):
+def get_suggestions(order, result_holder, event, checkout_call):
     with tracer.start_as_current_span("get_suggestions"):
         try:
             order_id = order["order_id"]
             purchased_books = [item["name"] for item in order.get("items", [])]
 
-            logging.debug(f"Function call_generate_suggestions(order_id = '{order_id}', order_data = {order}, result_dict = {result_holder})")
-            response = suggestions_stub.GetSuggestions(suggestions_pb2.SuggestionRequest(
-                purchased_books=purchased_books
+            response = checkout_call.call(suggestions_stub.GetSuggestions, suggestions_pb2.SuggestionRequest(
+                purchased_books=purchased_books,
+                order_id=order_id
             ))
             result_holder["suggested_books"] = response.suggested_books
-            logging.debug(f"Final vector clock from Suggestions: {response.vector_clock}")
+            suggestions_by_order.set(order_id, list(response.suggested_books))
+            suggestions_by_cart.set(cart_key(order), list(response.suggested_books))
+            logging.debug("Final vector clock from Suggestions: %s", response.vector_clock, extra={"order_id": order_id})
+            event.set()
+        except CheckoutCancelled:
+            result_holder["suggested_books"] = []
             event.set()
         except Exception as e:
-            logging.error(f"get_suggestions failed: {str(e)}")
+            logging.error("get_suggestions failed: %s", e)
             result_holder["suggested_books"] = []
+            suggestions_by_order.set(order["order_id"], [])
             event.set()
 
+def wait_for_suggestions(order, result_holder, event):
+    # Returns (suggested_books, pending).
+    if SUGGESTIONS_MODE != "budgeted" or event.wait(SUGGESTIONS_BUDGET):
+        event.wait()
+        return result_holder.get("suggested_books", []), False
+    stored = suggestions_by_order.setdefault(order["order_id"], SUGGESTIONS_PENDING)
+    if stored is not SUGGESTIONS_PENDING:
+        return stored, False  # finished just after the budget ran out
+    return suggestions_by_cart.get(cart_key(order), []), True
+
 # ----- Checkout Route -----
 @app.route('/checkout', methods=['POST'])
 def checkout():
-    order = request.json
-    logging.debug(f"Incoming Request Data: {order}")
-
-    if "order_id" not in order:
-        return jsonify({"status": "rejected", "reason": "Missing order_id in request"}), 400
-
+    order = request.get_json(silent=True)
+
+    body, status = checkout_once(order)
+    headers = {"Retry-After": str(body["retryAfter"])} if "retryAfter" in body else {}
+    return jsonify(body), status, headers
+
+def checkout_once(order):
+    # Idempotent wrapper around process_order; returns (body, status).
+    # Malformed orders are rejected here, before any RPC is sent.
+    error = validate_order(order)
+    if error is not None:
+        invalid_order_counter.add(1, {"field": error.path})
+        return {"status": "rejected", "reason": f"Invalid order: {error}", "field": error.path}, 400
+    logging.debug("Incoming order: %s", order, extra={"order_id": order["order_id"]})
+
+    try:
+        (body, status), outcome = checkout_results.run(
+            order["order_id"], order_fingerprint(order),
+            lambda: admit_and_process(order), cacheable=lambda result: result[1] != 429 and result[1] < 500
+        )
+    except IdempotencyConflict:
+        idempotency_counter.add(1, {"outcome": "conflict"})
+        return {"status": "rejected", "reason": "order_id was already used for a different order"}, 409
+    idempotency_counter.add(1, {"outcome": outcome})
+    if outcome != "miss":
+        logging.info("Replaying checkout result for order %s (%s)", order["order_id"], outcome)
+    return body, status
+
+# ----- Batch Checkout Route -----
+# Accepts a JSON array of orders, or NDJSON (one order per line). Orders are
+# processed BATCH_WORKERS at a time on a pool shared by all batches, each one
+# exactly as /checkout would. A JSON array gets a JSON array of results back
+# in input order; NDJSON (or Accept: application/x-ndjson) gets one result
+# line per order as soon as it finishes.
+# This only fans the orders out on the orchestrator: there is no RPC batching,
+# and every order still makes its own InitOrder, Check* and Enqueue calls.
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "16"))
+BATCH_MAX_ORDERS = int(os.getenv("BATCH_MAX_ORDERS", "1000"))
+batch_pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+
+def parse_batch(req):
+    # Returns a list of orders; a line that isn't valid JSON becomes None.
+    if req.mimetype == "application/x-ndjson":
+        orders = []
+        for line in req.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                orders.append(json.loads(line))
+            except ValueError:
+                orders.append(None)
+        return orders
+    orders = req.get_json(silent=True)
+    if isinstance(orders, dict):
+        orders = orders.get("orders")
+    return orders if isinstance(orders, list) else None
+
+def batch_result(index, order, body, status):
+    order_id = order.get("order_id") if isinstance(order, dict) else None
+    return {"index": index, "orderId": order_id, "httpStatus": status, **body}
+
+@app.route('/checkout/batch', methods=['POST'])
+def checkout_batch():
+    orders = parse_batch(request)
+    if orders is None:
+        return jsonify({"status": "rejected", "reason": "Expected a JSON array of orders or NDJSON"}), 400
+    if len(orders) > BATCH_MAX_ORDERS:
+        return jsonify({"status": "rejected", "reason": f"At most {BATCH_MAX_ORDERS} orders per batch"}), 413
+    logging.info("Batch checkout of %d orders", len(orders))
+
+    futures = {batch_pool.submit(checkout_once, order): index for index, order in enumerate(orders)}
+    streaming = request.mimetype == "application/x-ndjson" or request.accept_mimetypes.best == "application/x-ndjson"
+
+    if not streaming:
+        results = [None] * len(orders)
+        for future, index in futures.items():
+            results[index] = batch_result(index, orders[index], *future.result())
+        return jsonify(results)
+
+    def stream():
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                yield json.dumps(batch_result(index, orders[index], *future.result())) + "\n"
+        finally:
+            # Client went away: drop the orders that haven't started yet.
+            for future in futures:
+                future.cancel()
+
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+def process_order(order):
+    # Runs the checks, suggestions and enqueue for one order; returns (body, status).
     with tracer.start_as_current_span("checkout_process"):
         results = {}
-        fraud_done = threading.Event()
-        transaction_done = threading.Event()
         suggestion_done = threading.Event()
+        # Whichever check fails first decides the rejection and cancels the
+        # RPCs still in flight, including the suggestions lookup.
+        checkout_call = CheckoutCall(checks=("fraud", "transaction"))
 
-        fraud_thread = threading.Thread(target=fraud_event_flow, args=(order, results, fraud_done))
-        transaction_thread = threading.Thread(target=transaction_event_flow, args=(order, results, transaction_done))
-        suggestions_thread = threading.Thread(target=get_suggestions, args=(order, results, suggestion_done))
+        fraud_thread = threading.Thread(target=fraud_event_flow, args=(order, checkout_call))
+        transaction_thread = threading.Thread(target=transaction_event_flow, args=(order, checkout_call))
+        suggestions_thread = threading.Thread(target=get_suggestions, args=(order, results, suggestion_done, checkout_call))
 
         fraud_thread.start()
         transaction_thread.start()
         suggestions_thread.start()
 
-        fraud_done.wait()
-        if results.get("fraudulent", False):
-            return jsonify({"status": "rejected", "reason": "Fraud detected"}), 400
-
-        transaction_done.wait()
-        is_valid, reason = results.get("transaction", (False, "Transaction check failed"))
-        if not is_valid:
-            return jsonify({"status": "rejected", "reason": reason}), 400
+        checkout_call.finished.wait()
+        if checkout_call.rejection is not None:
+            return {"status": "rejected", "reason": checkout_call.rejection}, 400
 
-        suggestion_done.wait()
-        suggested_books = results.get("suggested_books", [])
+        suggested_books, suggestions_pending = wait_for_suggestions(order, results, suggestion_done)
 
         try:
             order_id = order["order_id"]
@@ -229,24 +475,41 @@ def checkout():
                 orderId=order_id,
                 amount=amount,
                 itemCount=item_count,
-                userType=user_type
+                userType=user_type,
+                books=[item["name"] for item in order.get("items", [])]
             ))
 
             if not enqueue_resp.success:
-                return jsonify({"status": "rejected", "reason": "Failed to enqueue order"}), 500
+                return {"status": "rejected", "reason": "Failed to enqueue order"}, 500
 
-            logging.info(f"Order {order_id} enqueued successfully.")
+            logging.info("Order %s enqueued successfully.", order_id)
             order_counter.add(1, {"user_type": user_type, "status": "approved"})
 
         except Exception as e:
-            logging.error(f"Enqueue failed: {str(e)}")
-            return jsonify({"status": "rejected", "reason": "Internal error during enqueue"}), 500
+            logging.error("Enqueue failed: %s", e)
+            return {"status": "rejected", "reason": "Internal error during enqueue"}, 500
 
-        return jsonify({
+        response = {
             "orderId": order["order_id"],
             "status": "Order Approved",
             "suggestedBooks": [{"title": book} for book in suggested_books],
-        })
+        }
+        if suggestions_pending:
+            response["suggestionsPending"] = True
+        return response, 200
+
+@app.route('/suggestions/<order_id>', methods=['GET'])
+def order_suggestions(order_id):
+    books = suggestions_by_order.get(order_id)
+    if books is None:
+        return jsonify({"orderId": order_id, "status": "unknown"}), 404
+    if books is SUGGESTIONS_PENDING:
+        return jsonify({"orderId": order_id, "status": "pending"}), 202
+    return jsonify({
+        "orderId": order_id,
+        "status": "ready",
+        "suggestedBooks": [{"title": book} for book in books],
+    })
 
 # ----- Run -----
 if __name__ == '__main__':
@@ -0,0 +1,218 @@
+import sys
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# OpenTelemetry imports
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+# asyncio-native variant of app.py: the same checkout flow on grpc.aio stubs,
+# meant to run under a multi-worker ASGI server, e.g.
+#   gunicorn -w 4 -k uvicorn.workers.UvicornWorker app_async:app
+
+# Set up OpenTelemetry resource
+resource = Resource(attributes={SERVICE_NAME: "orchestrator_async"})
+
+# Metrics setup
+metric_exporter = OTLPMetricExporter(endpoint="http://observability:4318/v1/metrics")
+metric_reader = PeriodicExportingMetricReader(metric_exporter)
+metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+meter = metrics.get_meter(__name__)
+order_counter = meter.create_counter("orders_processed", unit="1", description="Number of orders processed")
+
+# Setup gRPC stub paths
+FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
+for service in ("fraud_detection", "transaction_verification", "suggestions", "order_queue"):
+    sys.path.insert(0, os.path.abspath(os.path.join(FILE, f'../../../utils/pb/{service}')))
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+
+# Setup logging
+from logs import setup_logging
+setup_logging("OrchestratorAsync")
+
+from channels import get_aio_channel
+from fingerprints import card_fingerprint
+
+# Import gRPC stubs
+import fraud_detection_pb2 as fraud_detection
+import fraud_detection_pb2_grpc as fraud_detection_pb2_grpc
+import transaction_verification_pb2 as transaction_pb2
+import transaction_verification_pb2_grpc as transaction_pb2_grpc
+import suggestions_pb2 as suggestions_pb2
+import suggestions_pb2_grpc as suggestions_pb2_grpc
+import order_queue_pb2
+import order_queue_pb2_grpc
+
+from validation import validate_order
+
+# Per-call deadlines, in seconds; same values as the sync orchestrator.
+CHECK_TIMEOUT = 1.0
+SUGGESTIONS_TIMEOUT = 0.5
+ENQUEUE_TIMEOUT = 2.0
+
+class Rejected(Exception):
+    pass
+
+class Stubs:
+    # grpc.aio channels are bound to the event loop that creates them, so each
+    # worker opens its own at startup.
+    fraud = transaction = suggestions = order_queue = None
+
+    @classmethod
+    def open(cls):
+        cls.fraud = fraud_detection_pb2_grpc.FraudServiceStub(
+            get_aio_channel('fraud_detection:50051'))
+        cls.transaction = transaction_pb2_grpc.TransactionVerificationServiceStub(
+            get_aio_channel('transaction_verification:50052'))
+        cls.suggestions = suggestions_pb2_grpc.SuggestionsServiceStub(
+            get_aio_channel('suggestions:50053'))
+        cls.order_queue = order_queue_pb2_grpc.OrderQueueServiceStub(
+            get_aio_channel('order_queue:50056'))
+
+# ----- Transaction Verification Handler -----
+async def transaction_event_flow(order):
+    try:
+        order_id = order["order_id"]
+        user_data = {
+            "name": order["user"]["name"],
+            "contact": order["user"]["contact"],
+            "address": order["billingAddress"]["street"]
+        }
+        books = [item["name"] for item in order.get("items", [])]
+        card = order["creditCard"]
+        credit_card = str(card["number"]).replace(" ", "").replace("-", "")
+
+        init_response = await Stubs.transaction.InitOrder(transaction_pb2.InitOrderRequest(
+            order_id=order_id,
+            user_data=user_data,
+            books=books,
+            credit_card=credit_card,
+            expiration_date=str(card.get("expirationDate", "")).replace(" ", ""),
+            cvv=str(card.get("cvv", "")).strip()
+        ), timeout=CHECK_TIMEOUT)
+        if not init_response.success:
+            raise Rejected(init_response.message)
+
+        for check in (Stubs.transaction.CheckBooks, Stubs.transaction.CheckUserFields, Stubs.transaction.CheckCardFormat):
+            response = await check(transaction_pb2.EventRequest(order_id=order_id), timeout=CHECK_TIMEOUT)
+            if not response.is_success:
+                raise Rejected(response.message)
+    except (Rejected, asyncio.CancelledError):
+        raise
+    except Exception as e:
+        logging.error("transaction_event_flow failed: %s", e)
+        raise Rejected("Transaction service encountered an internal error")
+
+# ----- Fraud Detection Handler -----
+async def fraud_event_flow(order):
+    try:
+        order_id = order["order_id"]
+        init_response = await Stubs.fraud.InitOrder(fraud_detection.InitOrderRequest(
+            order_id=order_id,
+            user_id=order["user_id"],
+            amount=order["amount"],
+            user_type=order["user"].get("type", ""),
+            card_fingerprint=card_fingerprint(order["creditCard"]["number"])
+        ), timeout=CHECK_TIMEOUT)
+        if not init_response.success:
+            raise Rejected("Fraud detected")
+
+        for check in (Stubs.fraud.CheckUserFraud, Stubs.fraud.CheckCardFraud):
+            response = await check(fraud_detection.EventRequest(order_id=order_id), timeout=CHECK_TIMEOUT)
+            if not response.is_success:
+                raise Rejected("Fraud detected")
+    except (Rejected, asyncio.CancelledError):
+        raise
+    except Exception as e:
+        logging.error("fraud_event_flow failed: %s", e)
+        raise Rejected("Fraud detected")
+
+# ----- Book Suggestions -----
+async def get_suggestions(order):
+    try:
+        response = await Stubs.suggestions.GetSuggestions(suggestions_pb2.SuggestionRequest(
+            purchased_books=[item["name"] for item in order.get("items", [])],
+            order_id=order["order_id"]
+        ), timeout=SUGGESTIONS_TIMEOUT)
+        return list(response.suggested_books)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.error("get_suggestions failed: %s", e)
+        return []
+
+# ----- Checkout Route -----
+async def checkout(request):
+    try:
+        order = await request.json()
+    except ValueError:
+        return JSONResponse({"status": "rejected", "reason": "Request body is not valid JSON"}, status_code=400)
+
+    error = validate_order(order)
+    if error is not None:
+        return JSONResponse({"status": "rejected", "reason": f"Invalid order: {error}", "field": error.path}, status_code=400)
+
+    suggestions = asyncio.create_task(get_suggestions(order))
+    checks = [
+        asyncio.create_task(fraud_event_flow(order)),
+        asyncio.create_task(transaction_event_flow(order)),
+    ]
+    try:
+        # gather raises as soon as either check rejects; cancelling the
+        # remaining tasks cancels their in-flight RPCs too.
+        await asyncio.gather(*checks)
+    except Rejected as e:
+        for task in checks + [suggestions]:
+            task.cancel()
+        return JSONResponse({"status": "rejected", "reason": str(e)}, status_code=400)
+
+    suggested_books = await suggestions
+
+    order_id = order["order_id"]
+    user_type = order.get("user", {}).get("type", "regular")
+    try:
+        enqueue_resp = await Stubs.order_queue.Enqueue(order_queue_pb2.OrderRequest(
+            orderId=order_id,
+            amount=float(order.get("amount", 0)),
+            itemCount=len(order.get("items", [])),
+            userType=user_type,
+            books=[item["name"] for item in order.get("items", [])]
+        ), timeout=ENQUEUE_TIMEOUT)
+        if not enqueue_resp.success:
+            return JSONResponse({"status": "rejected", "reason": "Failed to enqueue order"}, status_code=500)
+    except Exception as e:
+        logging.error("Enqueue failed: %s", e)
+        return JSONResponse({"status": "rejected", "reason": "Internal error during enqueue"}, status_code=500)
+
+    order_counter.add(1, {"user_type": user_type, "status": "approved"})
+    return JSONResponse({
+        "orderId": order_id,
+        "status": "Order Approved",
+        "suggestedBooks": [{"title": book} for book in suggested_books],
+    })
+
+@asynccontextmanager
+async def lifespan(app):
+    Stubs.open()
+    yield
+
+app = Starlette(
+    routes=[Route('/checkout', checkout, methods=['POST'])],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan,
+)
+
+# ----- Run -----
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=8000)
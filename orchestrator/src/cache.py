@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe LRU map whose entries also expire after ttl seconds."""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            if entry[0] <= time.monotonic():
+                del self.entries[key]
+                return default
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self.lock:
+            self._set(key, value)
+
+    def setdefault(self, key, value):
+        # Stores value only if key is absent (or expired); returns what ends up cached.
+        with self.lock:
+            entry = self.entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > time.monotonic():
+                return entry[1]
+            self._set(key, value)
+            return value
+
+    def pop(self, key, default=None):
+        with self.lock:
+            entry = self.entries.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _set(self, key, value):
+        # Caller holds self.lock.
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+class IdempotencyConflict(Exception):
+    pass
+
+class _Flight:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.result = None
+
+class SingleFlightCache:
+    """Runs fn once per key: concurrent duplicates wait for the first call,
+    later ones get its cached result until the TTL expires."""
+
+    def __init__(self, max_size, ttl):
+        self.lock = threading.Lock()
+        self.results = TTLCache(max_size, ttl)  # key -> (fingerprint, result)
+        self.in_flight = {}  # key -> _Flight
+
+    def run(self, key, fingerprint, fn, cacheable=lambda result: True):
+        # Returns (result, outcome), outcome being "miss", "replay" or
+        # "coalesced". A key reused with a different fingerprint raises
+        # IdempotencyConflict.
+        with self.lock:
+            cached = self.results.get(key)
+            if cached is not None:
+                if cached[0] != fingerprint:
+                    raise IdempotencyConflict(key)
+                return cached[1], "replay"
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = _Flight(fingerprint)
+        if not leader:
+            if flight.fingerprint != fingerprint:
+                raise IdempotencyConflict(key)
+            flight.done.wait()
+            if flight.result is None:
+                # The first call raised; let this one try for itself.
+                return self.run(key, fingerprint, fn, cacheable)
+            return flight.result, "coalesced"
+
+        try:
+            flight.result = fn()
+            if cacheable(flight.result):
+                self.results.set(key, (fingerprint, flight.result))
+            return flight.result, "miss"
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            flight.done.set()
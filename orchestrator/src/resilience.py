@@ -0,0 +1,263 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import grpc
+from opentelemetry import metrics
+
+meter = metrics.get_meter(__name__)
+attempt_counter = meter.create_counter(
+    "grpc_client_attempts", unit="1", description="RPC attempts by stub, method and status code")
+extra_attempt_counter = meter.create_counter(
+    "grpc_client_extra_attempts", unit="1", description="Retries and hedges by stub and method")
+fast_fail_counter = meter.create_counter(
+    "grpc_client_fast_failures", unit="1", description="Calls rejected without being sent, by reason")
+breaker_counter = meter.create_counter(
+    "grpc_client_breaker_transitions", unit="1", description="Circuit breaker state changes by stub")
+call_latency = meter.create_histogram(
+    "grpc_client_latency", unit="ms", description="End-to-end call latency including retries and hedges")
+
+# Codes that mean "the server may not have done the work, try again". The
+# circuit breaker counts the same codes as downstream failures.
+RETRYABLE_CODES = {
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+}
+
+@dataclass(frozen=True)
+class MethodPolicy:
+    timeout: float = 1.0                 # per-attempt deadline, seconds
+    retries: int = 0                     # extra attempts after a retryable failure
+    hedge_after: Optional[float] = None  # send a second attempt if the first is this slow
+    backoff: float = 0.02                # base of the jittered exponential backoff
+
+class CircuitOpenError(grpc.RpcError):
+    def __init__(self, name):
+        super().__init__(f"circuit open for {name}")
+        self.name = name
+
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        return f"circuit open for {self.name}"
+
+class RetryBudget:
+    """Caps retries and hedges at a fraction of first attempts, shared by all stubs."""
+
+    def __init__(self, ratio=0.1, initial=10, max_tokens=100):
+        self.lock = threading.Lock()
+        self.ratio = ratio
+        self.tokens = float(initial)
+        self.max_tokens = max_tokens
+
+    def on_request(self):
+        with self.lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self):
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, reset_timeout=5.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def before_call(self):
+        # Returns True if this call is the half-open probe.
+        with self.lock:
+            if self.state == "closed":
+                return False
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let exactly one probe through; its outcome decides the state.
+                self._transition("half_open")
+                return True
+            fast_fail_counter.add(1, {"stub": self.name, "reason": "circuit_open"})
+            raise CircuitOpenError(self.name)
+
+    def release_probe(self):
+        # The probe ended without an outcome, e.g. it was cancelled: reopen,
+        # so another probe goes through after the cooldown.
+        with self.lock:
+            if self.state == "half_open":
+                self.opened_at = time.monotonic()
+                self._transition("open")
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            if self.state != "closed":
+                self._transition("closed")
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._transition("open")
+
+    def _transition(self, state):
+        # Caller holds self.lock.
+        self.state = state
+        breaker_counter.add(1, {"stub": self.name, "state": state})
+
+class ResilientCall:
+    """Future-like handle for one logical call; cancel() stops every attempt."""
+
+    def __init__(self, method, request):
+        self.method = method
+        self.request = request
+        self.lock = threading.Lock()
+        self.attempts = []
+        self.cancelled = False
+        self.attempt_done = threading.Event()
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            attempts = list(self.attempts)
+        for attempt in attempts:
+            attempt.cancel()
+        self.attempt_done.set()
+        return True
+
+    def result(self):
+        method = self.method
+        policy = method.policy
+        method.budget.on_request()
+        start = time.perf_counter()
+        retries = 0
+        try:
+            while True:
+                probe = method.breaker.before_call()
+                try:
+                    response = self._race()
+                except grpc.RpcError as e:
+                    code = e.code()
+                    if code in RETRYABLE_CODES:
+                        method.breaker.record_failure()
+                    else:
+                        # The server answered, so it is up.
+                        method.breaker.record_success()
+                    if code not in RETRYABLE_CODES or retries >= policy.retries:
+                        raise
+                    if not method.budget.try_withdraw():
+                        fast_fail_counter.add(1, {"stub": method.stub_name, "reason": "retry_budget"})
+                        raise
+                    retries += 1
+                    extra_attempt_counter.add(1, {"stub": method.stub_name, "method": method.name, "kind": "retry"})
+                    time.sleep(random.uniform(0, policy.backoff * 2 ** retries))
+                    continue
+                except BaseException:
+                    # Cancelled, or failed before reaching the server: no
+                    # outcome, but a probe must still give up its slot.
+                    if probe:
+                        method.breaker.release_probe()
+                    raise
+                method.breaker.record_success()
+                return response
+        finally:
+            call_latency.record((time.perf_counter() - start) * 1000,
+                                {"stub": method.stub_name, "method": method.name})
+
+    def _start_attempt(self):
+        with self.lock:
+            if self.cancelled:
+                raise grpc.FutureCancelledError()
+            attempt = self.method.multi_callable.future(self.request, timeout=self.method.policy.timeout)
+            self.attempts.append(attempt)
+        attempt.add_done_callback(lambda _: self.attempt_done.set())
+        return attempt
+
+    def _race(self):
+        # The first attempt to succeed wins. With hedging, a second attempt
+        # is sent if the first hasn't answered within hedge_after.
+        policy = self.method.policy
+        started = time.monotonic()
+        pending = [self._start_attempt()]
+        hedge_pending = policy.hedge_after is not None
+        last_error = None
+        while True:
+            self.attempt_done.clear()
+            for attempt in [a for a in pending if a.done()]:
+                pending.remove(attempt)
+                if self.cancelled:
+                    raise grpc.FutureCancelledError()
+                try:
+                    response = attempt.result()
+                except grpc.RpcError as e:
+                    last_error = e
+                    self._record_attempt(e.code())
+                    continue
+                self._record_attempt(grpc.StatusCode.OK)
+                for other in pending:
+                    other.cancel()
+                return response
+            if self.cancelled:
+                raise grpc.FutureCancelledError()
+            if not pending:
+                raise last_error
+
+            if hedge_pending:
+                remaining = policy.hedge_after - (time.monotonic() - started)
+                if remaining <= 0:
+                    hedge_pending = False
+                    if self.method.budget.try_withdraw():
+                        extra_attempt_counter.add(1, {"stub": self.method.stub_name, "method": self.method.name, "kind": "hedge"})
+                        pending.append(self._start_attempt())
+                    continue
+                self.attempt_done.wait(remaining)
+            else:
+                self.attempt_done.wait()
+
+    def _record_attempt(self, code):
+        attempt_counter.add(1, {"stub": self.method.stub_name, "method": self.method.name, "code": code.name})
+
+class ResilientMethod:
+    def __init__(self, multi_callable, stub_name, name, policy, breaker, budget):
+        self.multi_callable = multi_callable
+        self.stub_name = stub_name
+        self.name = name
+        self.policy = policy
+        self.breaker = breaker
+        self.budget = budget
+
+    def future(self, request):
+        return ResilientCall(self, request)
+
+    def __call__(self, request):
+        return self.future(request).result()
+
+class ResilientStub:
+    """Wraps a generated stub so each method gets deadlines, retries, hedging and a shared breaker."""
+
+    def __init__(self, stub, name, policies=None, default=MethodPolicy(), budget=None):
+        self._stub = stub
+        self._name = name
+        self._policies = policies or {}
+        self._default = default
+        self._budget = budget or RetryBudget()
+        self._breaker = CircuitBreaker(name)
+        self._methods = {}
+
+    def __getattr__(self, method_name):
+        method = self._methods.get(method_name)
+        if method is None:
+            method = ResilientMethod(
+                getattr(self._stub, method_name), self._name, method_name,
+                self._policies.get(method_name, self._default), self._breaker, self._budget
+            )
+            self._methods[method_name] = method
+        return method
@@ -0,0 +1,180 @@
+from typing import NamedTuple
+
+# Checkout payload validation. The schema below is compiled once, at import,
+# into nested closures; validating a good order allocates nothing, and the
+# path of the first bad field is only built on the way out of a failure.
+# Only shape and types are checked here: business rules (empty names, card
+# format, stock) stay with the services that own them.
+
+class ValidationError(NamedTuple):
+    path: str
+    message: str
+
+    def __str__(self):
+        return f"{self.path}: {self.message}" if self.path else self.message
+
+class String:
+    def __init__(self, min_length=0, optional=False):
+        self.min_length = min_length
+        self.optional = optional
+
+class Number:
+    def __init__(self, minimum=None, integer=False, optional=False):
+        self.minimum = minimum
+        self.integer = integer
+        self.optional = optional
+
+class Boolean:
+    def __init__(self, optional=False):
+        self.optional = optional
+
+class OneOf:
+    """Any of the given schemas, e.g. a card number sent as a string or a number."""
+
+    def __init__(self, *schemas, optional=False):
+        self.schemas = schemas
+        self.optional = optional
+
+class Object:
+    def __init__(self, fields, optional=False):
+        self.fields = fields
+        self.optional = optional
+
+class Array:
+    def __init__(self, items, max_items=None, optional=False):
+        self.items = items
+        self.max_items = max_items
+        self.optional = optional
+
+ORDER_SCHEMA = Object({
+    "order_id": String(min_length=1),
+    "user_id": String(),
+    "amount": Number(minimum=0),
+    "user": Object({
+        "name": String(),
+        "contact": String(),
+        "type": String(optional=True),
+    }),
+    "creditCard": Object({
+        "number": OneOf(String(), Number(integer=True)),
+        "expirationDate": String(optional=True),
+        "cvv": OneOf(String(), Number(integer=True), optional=True),
+    }),
+    "items": Array(Object({
+        "name": String(min_length=1),
+        "quantity": Number(minimum=0, integer=True),
+    }), max_items=100),
+    "billingAddress": Object({
+        "street": String(),
+        "city": String(optional=True),
+        "state": String(optional=True),
+        "zip": String(optional=True),
+        "country": String(optional=True),
+    }),
+    "payment_method": String(optional=True),
+    "shippingMethod": String(optional=True),
+    "termsAccepted": Boolean(optional=True),
+    "giftWrapping": Boolean(optional=True),
+})
+
+# ----- Compiler -----
+# A compiled check takes a value and returns None, or (path_parts, message)
+# where path_parts is a reversed list of keys/indexes, appended to while the
+# error bubbles up.
+
+def _compile(schema):
+    if isinstance(schema, String):
+        min_length = schema.min_length
+        def check(value):
+            if type(value) is not str:
+                return [], "expected a string"
+            if len(value) < min_length:
+                return [], "must not be empty" if min_length == 1 else f"must be at least {min_length} characters"
+            return None
+        return check
+
+    if isinstance(schema, Number):
+        minimum, integer = schema.minimum, schema.integer
+        types = (int,) if integer else (int, float)
+        expected = "expected an integer" if integer else "expected a number"
+        def check(value):
+            # bool is an int subclass, but true/false is never a valid amount.
+            if type(value) not in types:
+                return [], expected
+            if minimum is not None and value < minimum:
+                return [], f"must be >= {minimum}"
+            return None
+        return check
+
+    if isinstance(schema, Boolean):
+        def check(value):
+            return None if type(value) is bool else ([], "expected true or false")
+        return check
+
+    if isinstance(schema, OneOf):
+        checks = [_compile(s) for s in schema.schemas]
+        def check(value):
+            error = None
+            for c in checks:
+                error = c(value)
+                if error is None:
+                    return None
+            return error
+        return check
+
+    if isinstance(schema, Object):
+        required = tuple((name, _compile(s)) for name, s in schema.fields.items() if not s.optional)
+        optional = tuple((name, _compile(s)) for name, s in schema.fields.items() if s.optional)
+        def check(value):
+            if type(value) is not dict:
+                return [], "expected an object"
+            for name, c in required:
+                if name not in value:
+                    return [name], "is required"
+                error = c(value[name])
+                if error is not None:
+                    error[0].append(name)
+                    return error
+            for name, c in optional:
+                field = value.get(name)
+                if field is not None:
+                    error = c(field)
+                    if error is not None:
+                        error[0].append(name)
+                        return error
+            return None
+        return check
+
+    if isinstance(schema, Array):
+        item_check, max_items = _compile(schema.items), schema.max_items
+        def check(value):
+            if type(value) is not list:
+                return [], "expected an array"
+            if max_items is not None and len(value) > max_items:
+                return [], f"must have at most {max_items} entries"
+            for index, item in enumerate(value):
+                error = item_check(item)
+                if error is not None:
+                    error[0].append(index)
+                    return error
+            return None
+        return check
+
+    raise TypeError(f"Unknown schema node {schema!r}")
+
+def _format_path(parts):
+    path = ""
+    for part in reversed(parts):
+        path += f"[{part}]" if isinstance(part, int) else (f".{part}" if path else part)
+    return path
+
+def compile_validator(schema):
+    check = _compile(schema)
+    def validate(value):
+        error = check(value)
+        if error is None:
+            return None
+        return ValidationError(_format_path(error[0]), error[1])
+    return validate
+
+validate_order = compile_validator(ORDER_SCHEMA)
@@ -1,11 +1,20 @@
 import os
 import sys
 import time
+import random
 import threading
+import logging
 import grpc
 from concurrent import futures
 from dotenv import load_dotenv
 
+# OpenTelemetry imports
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
 FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
 proto_path = os.path.abspath(os.path.join(FILE, '../../../utils/pb/order_executor'))
 sys.path.insert(0, proto_path)
@@ -16,14 +25,62 @@ sys.path.insert(0, order_queue_proto_path)
 books_db_path = os.path.abspath(os.path.join(FILE, '../../../utils/pb/books_database'))
 sys.path.insert(0, books_db_path)
 
+suggestions_proto_path = os.path.abspath(os.path.join(FILE, '../../../utils/pb/suggestions'))
+sys.path.insert(0, suggestions_proto_path)
+
 import books_database_pb2
 import books_database_pb2_grpc
 import order_executor_pb2
 import order_executor_pb2_grpc
 import order_queue_pb2
 import order_queue_pb2_grpc
+import suggestions_pb2
+import suggestions_pb2_grpc
+
+# Setup logging
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+from logs import setup_logging
 
 load_dotenv()
+setup_logging(f"OrderExecutor {os.getenv('REPLICA_ID', '1')}")
+
+from channels import get_channel, server_options
+
+# Election timing (seconds). Every RPC carries a deadline so a dead peer costs
+# at most one timeout, and rounds are jittered so replicas that start together
+# don't keep colliding.
+ELECTION_RPC_TIMEOUT = float(os.getenv("ELECTION_RPC_TIMEOUT", "0.2"))
+ELECTION_JITTER = (0.02, 0.12)
+COORDINATOR_TIMEOUT = (0.3, 0.5)
+
+# Failure detection (seconds). The leader only executes orders while a
+# majority acknowledged a heartbeat within LEASE_DURATION; followers wait
+# longer than that before electing, so the old lease has always expired by
+# the time a new leader starts executing.
+HEARTBEAT_INTERVAL = float(os.getenv("HEARTBEAT_INTERVAL", "0.1"))
+LEASE_DURATION = float(os.getenv("LEASE_DURATION", "0.3"))
+FAILURE_TIMEOUT = (LEASE_DURATION + 0.1, LEASE_DURATION + 0.3)
+
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "5"))
+# "leader": the elected leader executes every partition of the queue.
+# "partitioned": every live replica executes the partitions assigned to it.
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "leader")
+QUEUE_RPC_TIMEOUT = 2
+OBSERVE_RPC_TIMEOUT = 0.5
+
+# Metrics setup
+resource = Resource(attributes={SERVICE_NAME: f"order_executor_{os.getenv('REPLICA_ID', '1')}"})
+metric_exporter = OTLPMetricExporter(endpoint="http://observability:4318/v1/metrics")
+metric_reader = PeriodicExportingMetricReader(metric_exporter)
+metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+meter = metrics.get_meter(__name__)
+
+election_counter = meter.create_counter(
+    "leader_elections", unit="1", description="Elections started, by trigger")
+detection_time = meter.create_histogram(
+    "leader_failure_detection_time", unit="ms", description="Time from the last leader heartbeat to suspecting failure")
+failover_time = meter.create_histogram(
+    "leader_failover_time", unit="ms", description="Time from suspecting the leader to knowing a new one")
 
 class ExecutorService(order_executor_pb2_grpc.OrderExecutorServiceServicer):
     def __init__(self, replica_id, peers):
@@ -31,96 +88,362 @@ class ExecutorService(order_executor_pb2_grpc.OrderExecutorServiceServicer):
         self.peers = peers
         self.is_leader = False
         self.leader_id = None
+        self.term = 0
         self.lock = threading.Lock()
+        self.election_lock = threading.Lock()
+        self.leader_announced = threading.Event()
+        self.heartbeat_thread = None
+
+        self.last_heartbeat = time.monotonic()
+        self.failure_timeout = random.uniform(*FAILURE_TIMEOUT)
+        self.suspected_at = None
+        self.lease_expiry = 0.0
+        self.quorum = (len(peers) + 1) // 2 + 1
+
+        # Live replicas as published by the leader; partitions are assigned
+        # over it. Empty until we hear from a leader.
+        self.members = []
+        self.membership_version = 0
+        self.queue_partitions = 1  # read from the queue, see refresh_partitions()
 
-        self.order_queue_channel = grpc.insecure_channel("order_queue:50056")
+        self.order_queue_channel = get_channel("order_queue:50056")
         self.order_queue_stub = order_queue_pb2_grpc.OrderQueueServiceStub(self.order_queue_channel)
-        self.books_db_channel = grpc.insecure_channel("books_primary:50060")
+        self.books_db_channel = get_channel("books_primary:50060")
         self.books_db_stub = books_database_pb2_grpc.BooksDatabaseStub(self.books_db_channel)
+        self.suggestions_stub = suggestions_pb2_grpc.SuggestionsServiceStub(get_channel("suggestions:50053"))
 
-        print(f"[Init] ExecutorService for Replica {self.replica_id} initialized.")
+        # One long-lived channel per peer, reused by every election round.
+        self.peer_stubs = {
+            peer['id']: order_executor_pb2_grpc.OrderExecutorServiceStub(
+                get_channel(f"{peer['host']}:{peer['port']}"))
+            for peer in self.peers
+        }
+
+        logging.info("[Init] ExecutorService for Replica %s initialized.", self.replica_id)
         peer_list_str = [f"{p['id']}:{p['host']}:{p['port']}" for p in self.peers]
-        print(f"[Init] Peers configured: {peer_list_str}")
+        logging.info("[Init] Peers configured: %s", peer_list_str)
 
-        threading.Thread(target=self.delayed_start_election_with_retries, daemon=True).start()
+    def start(self):
+        threading.Thread(target=self.delayed_start_election, daemon=True).start()
+        threading.Thread(target=self.monitor_leader, daemon=True).start()
+        threading.Thread(target=self.run, daemon=True).start()
 
-    def delayed_start_election_with_retries(self):
-        max_retries = 10
-        retry_interval = 2
-        for attempt in range(max_retries):
-            print(f"[Startup] Replica {self.replica_id} trying to connect to peers (attempt {attempt+1})...")
-            all_reachable = True
-            for peer in self.peers:
-                try:
-                    channel = grpc.insecure_channel(f"{peer['host']}:{peer['port']}")
-                    grpc.channel_ready_future(channel).result(timeout=1)
-                except Exception:
-                    all_reachable = False
-                    break
-            if all_reachable:
-                print(f"[Startup] All peers reachable. Starting election...")
-                self.start_election()
-                return
-            time.sleep(retry_interval)
-        print(f"[Startup] Could not reach all peers after {max_retries} attempts. Starting election anyway.")
+    def delayed_start_election(self):
+        time.sleep(random.uniform(*ELECTION_JITTER))
+        if self.leader_id is not None:
+            return  # a higher replica already announced itself
+        election_counter.add(1, {"trigger": "startup"})
         self.start_election()
 
+    def monitor_leader(self):
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL / 2)
+            with self.lock:
+                if self.is_leader:
+                    continue
+                silence = time.monotonic() - self.last_heartbeat
+                if silence < self.failure_timeout:
+                    continue
+                logging.warning("[FailureDetector] No heartbeat from leader %s for %.0f ms", self.leader_id,
+                                silence * 1000)
+                if self.suspected_at is None:
+                    detection_time.record(silence * 1000)
+                    self.suspected_at = time.monotonic()
+                # Back off before suspecting again, and re-randomize so
+                # followers don't all time out together next time.
+                self.failure_timeout = silence + random.uniform(*FAILURE_TIMEOUT)
+            election_counter.add(1, {"trigger": "leader_timeout"})
+            self.trigger_election()
+
+    def trigger_election(self):
+        threading.Thread(target=self.start_election, daemon=True).start()
+
     def start_election(self):
-        print(f"Replica {self.replica_id} initiating election...")
-        higher_ids = [peer for peer in self.peers if peer['id'] > self.replica_id]
-        received_ok = False
+        # Only one election round per replica at a time; a concurrent trigger
+        # is already covered by the round in progress.
+        if not self.election_lock.acquire(blocking=False):
+            return
+        try:
+            while True:
+                started = time.perf_counter()
+                logging.info("Replica %s initiating election...", self.replica_id)
+                self.leader_announced.clear()
+                higher_ids = [peer for peer in self.peers if peer['id'] > self.replica_id]
+
+                # Fan out to all higher replicas at once; the round is bounded
+                # by a single ELECTION_RPC_TIMEOUT regardless of peer count.
+                request = order_executor_pb2.ElectionRequest(sender_id=self.replica_id)
+                calls = [
+                    (peer, self.peer_stubs[peer['id']].StartElection.future(request, timeout=ELECTION_RPC_TIMEOUT))
+                    for peer in higher_ids
+                ]
+                received_ok = False
+                for peer, call in calls:
+                    try:
+                        if call.result().acknowledged:
+                            logging.debug("Received OK from Replica %s", peer['id'])
+                            received_ok = True
+                    except grpc.RpcError as e:
+                        logging.debug("Failed to contact %s:%s: %s", peer['host'], peer['port'], e.code())
+
+                if not received_ok:
+                    self.become_leader()
+                    logging.info("[LeaderElection] Election settled in %.0f ms", (time.perf_counter() - started) * 1000)
+                    return
 
-        for peer in higher_ids:
+                # A higher replica took over; it should announce itself shortly.
+                # If it dies before doing so, run another round.
+                if self.leader_announced.wait(random.uniform(*COORDINATOR_TIMEOUT)):
+                    with self.lock:
+                        if self.leader_id is not None and self.leader_id > self.replica_id:
+                            return
+                logging.warning("[LeaderElection] No coordinator announced, retrying election")
+                time.sleep(random.uniform(*ELECTION_JITTER))
+        finally:
+            self.election_lock.release()
+
+    def become_leader(self):
+        with self.lock:
+            self.is_leader = True
+            self.leader_id = self.replica_id
+            self.term += 1
+            self.lease_expiry = 0.0
+            self.members = [self.replica_id]
+            self.membership_version = 0
+            self._record_failover()
+            logging.info("[LeaderElection] Replica %s is now the LEADER (term %s)", self.replica_id, self.term)
+
+        announcement = order_executor_pb2.LeaderAnnouncement(leader_id=self.replica_id, term=self.term)
+        calls = [
+            (peer, self.peer_stubs[peer['id']].AnnounceLeader.future(announcement, timeout=ELECTION_RPC_TIMEOUT))
+            for peer in self.peers
+        ]
+        for peer, call in calls:
             try:
-                channel = grpc.insecure_channel(f"{peer['host']}:{peer['port']}")
-                stub = order_executor_pb2_grpc.OrderExecutorServiceStub(channel)
-                response = stub.StartElection(order_executor_pb2.ElectionRequest(sender_id=self.replica_id))
-                print(f"Received OK from Replica {peer['id']}")
-                received_ok = True
-            except Exception as e:
-                print(f"Failed to contact {peer['host']}:{peer['port']}: {e}")
-
-        if not received_ok:
+                call.result()
+            except grpc.RpcError as e:
+                logging.debug("Could not inform peer %s about new leader: %s", peer['id'], e.code())
+
+        with self.lock:
+            if self.is_leader and (self.heartbeat_thread is None or not self.heartbeat_thread.is_alive()):
+                self.heartbeat_thread = threading.Thread(target=self.send_heartbeats, daemon=True)
+                self.heartbeat_thread.start()
+
+    def send_heartbeats(self):
+        while self.is_leader:
+            round_start = time.monotonic()
+            request = order_executor_pb2.HeartbeatRequest(
+                leader_id=self.replica_id, term=self.term,
+                members=self.members, membership_version=self.membership_version
+            )
+            calls = [
+                (peer, self.peer_stubs[peer['id']].Heartbeat.future(request, timeout=HEARTBEAT_INTERVAL))
+                for peer in self.peers
+            ]
+            alive = [self.replica_id]  # the leader counts towards its own quorum
+            newer = None
+            for peer, call in calls:
+                try:
+                    response = call.result()
+                except grpc.RpcError:
+                    continue
+                if response.accepted:
+                    alive.append(peer['id'])
+                elif response.term > self.term and (newer is None or response.term > newer.term):
+                    newer = response
+
             with self.lock:
-                self.is_leader = True
-                self.leader_id = self.replica_id
-                print(f"[LeaderElection] Replica {self.replica_id} is now the LEADER")
+                if newer is not None and self.is_leader:
+                    logging.warning("[Heartbeat] Replica %s leads newer term %s, stepping down", newer.leader_id,
+                                    newer.term)
+                    self.is_leader = False
+                    self.leader_id = newer.leader_id
+                    self.term = newer.term
+                    self.lease_expiry = 0.0
+                    self.last_heartbeat = time.monotonic()
+                elif self.is_leader:
+                    if len(alive) >= self.quorum:
+                        # Measured from the round start, so the lease never outlives
+                        # what the followers have actually acknowledged.
+                        self.lease_expiry = round_start + LEASE_DURATION
+                    alive.sort()
+                    if alive != self.members:
+                        # Published with the next heartbeat; replicas then
+                        # recompute their partitions and the new version lets
+                        # the new owners take over the queue leases.
+                        self.members = alive
+                        self.membership_version += 1
+                        logging.info("[Membership] Live replicas %s (version %s)", alive, self.membership_version)
 
-                for peer in self.peers:
-                    try:
-                        channel = grpc.insecure_channel(f"{peer['host']}:{peer['port']}")
-                        stub = order_executor_pb2_grpc.OrderExecutorServiceStub(channel)
-                        stub.AnnounceLeader(order_executor_pb2.LeaderAnnouncement(leader_id=self.replica_id))
-                    except Exception as e:
-                        print(f"Could not inform peer {peer['id']} about new leader: {e}")
-                self.run()
+            if newer is not None:
+                if newer.leader_id < self.replica_id:
+                    self.trigger_election()
+                return
+            time.sleep(max(0.0, HEARTBEAT_INTERVAL - (time.monotonic() - round_start)))
+
+    def has_lease(self):
+        return self.is_leader and time.monotonic() < self.lease_expiry
+
+    def _record_failover(self):
+        # Caller holds self.lock.
+        if self.suspected_at is not None:
+            failover_time.record((time.monotonic() - self.suspected_at) * 1000)
+            self.suspected_at = None
 
     def StartElection(self, request, context):
-        print(f"🗳️ Election thread started on replica {self.replica_id}")
-        print(f"Received election request from {request.sender_id}")
+        logging.debug("Received election request from %s", request.sender_id)
         if self.replica_id > request.sender_id:
-            print(f"Responding to election from {request.sender_id} as I have higher ID {self.replica_id}")
+            logging.debug("Responding to election from %s as I have higher ID %s", request.sender_id, self.replica_id)
+            # Bully: a lower replica is looking for a leader, so take over.
+            self.trigger_election()
             return order_executor_pb2.ElectionResponse(acknowledged=True)
         return order_executor_pb2.ElectionResponse(acknowledged=False)
 
     def AnnounceLeader(self, request, context):
         with self.lock:
+            if request.term < self.term:
+                logging.info("Ignoring stale leader announcement from %s (term %s < %s)", request.leader_id,
+                             request.term, self.term)
+                return order_executor_pb2.Ack(received=False)
             self.leader_id = request.leader_id
+            self.term = request.term
             self.is_leader = (self.replica_id == request.leader_id)
-            print(f"📢 Leader announced: Replica {self.leader_id}")
+            self.last_heartbeat = time.monotonic()
+            self.failure_timeout = random.uniform(*FAILURE_TIMEOUT)
+            self._record_failover()
+            logging.info("📢 Leader announced: Replica %s (term %s)", self.leader_id, self.term)
+        self.leader_announced.set()
+        if request.leader_id < self.replica_id:
+            # A lower replica won while we were unreachable; reclaim leadership.
+            self.trigger_election()
         return order_executor_pb2.Ack(received=True)
 
+    def Heartbeat(self, request, context):
+        with self.lock:
+            if request.term < self.term:
+                return order_executor_pb2.HeartbeatResponse(
+                    accepted=False, leader_id=self.leader_id or 0, term=self.term)
+            if request.term > self.term or self.leader_id != request.leader_id:
+                logging.info("[Heartbeat] Following Replica %s (term %s)", request.leader_id, request.term)
+                self._record_failover()
+            was_leader = self.is_leader and request.leader_id != self.replica_id
+            self.term = request.term
+            self.leader_id = request.leader_id
+            self.is_leader = (self.replica_id == request.leader_id)
+            self.last_heartbeat = time.monotonic()
+            self.failure_timeout = random.uniform(*FAILURE_TIMEOUT)
+            self.members = list(request.members)
+            self.membership_version = request.membership_version
+        if was_leader and request.leader_id < self.replica_id:
+            # Two leaders won the same term; the higher replica keeps it.
+            self.trigger_election()
+        return order_executor_pb2.HeartbeatResponse(
+            accepted=True, leader_id=request.leader_id, term=request.term)
+
+    def owned_partitions(self):
+        with self.lock:
+            if EXECUTION_MODE != "partitioned":
+                return list(range(self.queue_partitions)) if self.has_lease() else []
+            if self.is_leader:
+                in_cluster = self.has_lease()
+            else:
+                # Same bound as the leader lease: a follower cut off from the
+                # leader stops before its partitions are reassigned.
+                in_cluster = (time.monotonic() - self.last_heartbeat < LEASE_DURATION
+                              and self.replica_id in self.members)
+            if not in_cluster:
+                return []
+            members = self.members
+            return [p for p in range(self.queue_partitions) if members[p % len(members)] == self.replica_id]
+
+    def refresh_partitions(self):
+        # Ownership is computed over the queue's partition count, so every
+        # replica asks for it: a replica that owns no partition never sees a
+        # lease reply to learn it from.
+        try:
+            response = self.order_queue_stub.GetPartitions(order_queue_pb2.Empty(), timeout=QUEUE_RPC_TIMEOUT)
+        except grpc.RpcError as e:
+            logging.warning("[OrderExecutor %s] Could not read the queue's partition count: %s", self.replica_id,
+                            e.code())
+            return
+        self.queue_partitions = response.partitions or 1
+
     def run(self):
+        refresh_at = 0.0
         while True:
-            try:
-                order = self.order_queue_stub.Dequeue(order_queue_pb2.Empty())
-                if hasattr(order, "order_id") and order.order_id:
-                    print(f"[OrderExecutor {self.replica_id}] Executing order {order.order_id}")
-                else:
-                    print(f"[OrderExecutor {self.replica_id}] Queue is empty.")
-            except Exception as e:
-                print(f"[OrderExecutor {self.replica_id}] Failed to dequeue: {e}")
-            time.sleep(5)
+            if time.monotonic() >= refresh_at:
+                self.refresh_partitions()
+                refresh_at = time.monotonic() + POLL_INTERVAL
+            partitions = self.owned_partitions()
+            if not partitions:
+                # Not the leader, or lost contact with the majority: someone
+                # else may already be executing, so hold off.
+                time.sleep(HEARTBEAT_INTERVAL)
+                continue
+            executed = 0
+            for partition in partitions:
+                try:
+                    executed += self.poll_partition(partition)
+                except grpc.RpcError as e:
+                    logging.warning("[OrderExecutor %s] Failed to dequeue partition %s: %s %s", self.replica_id,
+                                    partition, e.code(), e.details())
+            if not executed:
+                time.sleep(POLL_INTERVAL)
+
+    def poll_partition(self, partition):
+        with self.lock:
+            term = self.term
+            version = self.membership_version if EXECUTION_MODE == "partitioned" else 0
+        # Renewed on every poll. Once a newer leader or assignment is granted
+        # the partition our token goes stale and Dequeue is rejected.
+        lease = self.order_queue_stub.AcquireLease(order_queue_pb2.LeaseRequest(
+            holder_id=self.replica_id, term=term, partition=partition, assignment_version=version
+        ), timeout=QUEUE_RPC_TIMEOUT)
+        self.queue_partitions = lease.partitions or 1
+        if not lease.granted:
+            logging.debug("[OrderExecutor %s] Partition %s lease held by executor %s", self.replica_id, partition,
+                          lease.holder_id)
+            return 0
+        order = self.order_queue_stub.Dequeue(order_queue_pb2.DequeueRequest(
+            fencing_token=lease.fencing_token, partition=partition
+        ), timeout=QUEUE_RPC_TIMEOUT)
+        if not order.orderId:
+            return 0
+        self.execute(order)
+        return 1
+
+    def execute(self, order):
+        ack_request = order_queue_pb2.AckRequest(orderId=order.orderId, receipt=order.receipt)
+        if order.partition not in self.owned_partitions():
+            # Ownership lapsed since the dequeue; hand the order back for the
+            # new owner instead of waiting out the visibility timeout.
+            logging.warning("[OrderExecutor %s] Lost partition %s, returning order %s", self.replica_id,
+                            order.partition, order.orderId, extra={"order_id": order.orderId})
+            self.order_queue_stub.Nack(ack_request, timeout=QUEUE_RPC_TIMEOUT)
+            return
+        logging.info("[OrderExecutor %s] Executing order %s (delivery %s)", self.replica_id, order.orderId,
+                     order.deliveryCount, extra={"order_id": order.orderId})
+        ack = self.order_queue_stub.Ack(ack_request, timeout=QUEUE_RPC_TIMEOUT)
+        if not ack.success:
+            logging.warning("[OrderExecutor %s] Ack for %s rejected: %s", self.replica_id, order.orderId,
+                            ack.message, extra={"order_id": order.orderId})
+            return
+        self.observe_order(order)
+
+    def observe_order(self, order):
+        # Best effort and off the execution path: a missed observation only
+        # makes suggestions slightly staler.
+        if not order.books:
+            return
+        call = self.suggestions_stub.ObserveOrder.future(
+            suggestions_pb2.ObserveOrderRequest(order_id=order.orderId, books=order.books),
+            timeout=OBSERVE_RPC_TIMEOUT)
+
+        def log_failure(future):
+            if not future.cancelled() and future.exception() is not None:
+                logging.debug("ObserveOrder for %s failed: %s", order.orderId, future.exception().code(),
+                              extra={"order_id": order.orderId})
+        call.add_done_callback(log_failure)
 
 def serve():
     replica_id = int(os.getenv("REPLICA_ID", "1"))
@@ -133,26 +456,16 @@ def serve():
             peer_id, host, port_str = peer.split(":")
             peers.append({"id": int(peer_id), "host": host, "port": port_str})
 
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    # Prepare the service but don't instantiate yet
-    service_placeholder = order_executor_pb2_grpc.OrderExecutorServiceServicer()
-
-    order_executor_pb2_grpc.add_OrderExecutorServiceServicer_to_server(service_placeholder, server)
-    server.add_insecure_port(f"[::]:{port}")
-    print(f"🚀 Order Executor {replica_id} binding to port {port}")
-    print("🔧 Starting gRPC server...")
-    server.start()
-    print("✅ gRPC server started.")
-
-    # Instantiate the service after the server is listening
     service = ExecutorService(replica_id, peers)
-
-    # Replace the placeholder (server already running)
-    server.stop(0)  # Stop the previous placeholder service immediately
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=server_options())
     order_executor_pb2_grpc.add_OrderExecutorServiceServicer_to_server(service, server)
     server.add_insecure_port(f"[::]:{port}")
+    logging.info("🚀 Order Executor %s binding to port %s", replica_id, port)
     server.start()
+    logging.info("✅ gRPC server started.")
+
+    # Elect only once we can answer peers' election requests ourselves.
+    service.start()
 
     server.wait_for_termination()
 
@@ -5,6 +5,9 @@ import time
 import os
 import sys
 import heapq
+import uuid
+import zlib
+import logging
 from dataclasses import dataclass, field
 
 FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
@@ -14,19 +17,70 @@ sys.path.insert(0, order_queue_grpc_path)
 import order_queue_pb2
 import order_queue_pb2_grpc
 
+# Setup logging
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+from logs import setup_logging
+setup_logging("OrderQueue")
+
+from channels import server_options
+
+LEASE_MS = int(os.getenv("QUEUE_LEASE_MS", "10000"))
+VISIBILITY_TIMEOUT = float(os.getenv("VISIBILITY_TIMEOUT", "30"))
+NUM_PARTITIONS = int(os.getenv("QUEUE_PARTITIONS", "1"))
+
 @dataclass(order=True)
 class PrioritizedOrder:
     priority: int
     timestamp: float = field(compare=True)
     order_id: str = field(compare=False)
+    delivery_count: int = field(default=0, compare=False)
+    partition: int = field(default=0, compare=False)
+    books: tuple = field(default=(), compare=False)
+
+@dataclass
+class Lease:
+    holder_id: int = 0
+    term: int = 0
+    version: int = 0
+    token: int = 0
+    expires: float = 0.0
+
+@dataclass
+class Partition:
+    queue: list = field(default_factory=list)  # Priority queue using heapq
+    lease: Lease = field(default_factory=Lease)
+
+@dataclass
+class Delivery:
+    order: PrioritizedOrder
+    receipt: str
+    deadline: float
+
+def partition_for(books, order_id, partitions):
+    # Orders are keyed on their alphabetically first title, so orders whose
+    # first title is the same land in the same partition and are executed one
+    # at a time by whichever executor owns it. Ordering across titles is not
+    # guaranteed: two orders that share only a later title may land in
+    # different partitions and run concurrently. crc32 rather than hash()
+    # keeps the mapping stable across restarts.
+    key = min(books) if books else order_id
+    return zlib.crc32(key.encode()) % partitions
 
 class OrderQueueService(order_queue_pb2_grpc.OrderQueueServiceServicer):
-    def __init__(self):
+    def __init__(self, partitions=NUM_PARTITIONS):
         self._lock = threading.Lock()
-        self._queue = []  # Priority queue using heapq
+        self._partitions = [Partition() for _ in range(partitions)]
+        self._in_flight = {}  # order_id -> Delivery awaiting Ack
+        self._pending = set()  # order_ids queued or in flight, until acked
 
     def Enqueue(self, request, context):
         with self._lock:
+            if request.orderId in self._pending:
+                # A retried Enqueue whose first attempt did get through.
+                logging.info("♻️ Duplicate Enqueue for Order: %s, ignored", request.orderId,
+                             extra={"order_id": request.orderId})
+                return order_queue_pb2.EnqueueResponse(success=True)
+
             # Enhanced priority heuristic: higher amount + more items + premium user bonus
             priority_score = request.amount + request.itemCount
 
@@ -34,26 +88,117 @@ class OrderQueueService(order_queue_pb2_grpc.OrderQueueServiceServicer):
                 priority_score += 5
             priority = -priority_score  # Negate for max-heap behavior using heapq
 
-            order = PrioritizedOrder(priority, time.time(), request.orderId)
-            heapq.heappush(self._queue, order)
-            print(f"✅ Enqueued Order: {request.orderId} with priority {priority_score}")
+            partition = partition_for(request.books, request.orderId, len(self._partitions))
+            order = PrioritizedOrder(priority, time.time(), request.orderId, partition=partition,
+                                     books=tuple(request.books))
+            heapq.heappush(self._partitions[partition].queue, order)
+            self._pending.add(request.orderId)
+            logging.debug("✅ Enqueued Order: %s with priority %s in partition %s", request.orderId, priority_score,
+                          partition, extra={"order_id": request.orderId})
             return order_queue_pb2.EnqueueResponse(success=True)
 
+    def AcquireLease(self, request, context):
+        if not 0 <= request.partition < len(self._partitions):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Queue has {len(self._partitions)} partitions")
+        with self._lock:
+            now = time.monotonic()
+            partition = self._partitions[request.partition]
+            lease = partition.lease
+            requested, current = (request.term, request.assignment_version), (lease.term, lease.version)
+            if request.holder_id == lease.holder_id and requested == current:
+                lease.expires = now + LEASE_MS / 1000
+            elif now >= lease.expires or requested > current:
+                # New holder: bump the fencing token so the previous holder's
+                # Dequeue calls are rejected from now on. An expired lease goes
+                # to any term, since executor terms only live in memory and
+                # start over when every executor restarts.
+                partition.lease = lease = Lease(
+                    request.holder_id, request.term, request.assignment_version,
+                    lease.token + 1, now + LEASE_MS / 1000
+                )
+                logging.info("🔑 Partition %s leased to executor %s (term %s, version %s, token %s)",
+                             request.partition, lease.holder_id, lease.term, lease.version, lease.token)
+            else:
+                # Still held, and not by a newer term or assignment: this is
+                # e.g. the losing side of a partition or an executor that
+                # missed a rebalance.
+                return self._lease_response(False, lease)
+            return self._lease_response(True, lease)
+
+    def _lease_response(self, granted, lease):
+        return order_queue_pb2.LeaseResponse(
+            granted=granted, fencing_token=lease.token if granted else 0, lease_ms=LEASE_MS,
+            holder_id=lease.holder_id, partitions=len(self._partitions)
+        )
+
+    def GetPartitions(self, request, context):
+        return order_queue_pb2.PartitionsResponse(partitions=len(self._partitions))
+
     def Dequeue(self, request, context):
+        if not 0 <= request.partition < len(self._partitions):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Queue has {len(self._partitions)} partitions")
         with self._lock:
-            if self._queue:
-                order = heapq.heappop(self._queue)
-                print(f"🔄 Dequeued Order: {order.order_id}")
-                return order_queue_pb2.DequeueResponse(orderId=order.order_id)
+            now = time.monotonic()
+            partition = self._partitions[request.partition]
+            if request.fencing_token != partition.lease.token or now >= partition.lease.expires:
+                logging.warning("⛔ Rejected Dequeue on partition %s with stale fencing token %s", request.partition,
+                                request.fencing_token)
+                context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Stale or expired fencing token")
+
+            self._requeue_expired(now)
+            if partition.queue:
+                order = heapq.heappop(partition.queue)
+                order.delivery_count += 1
+                delivery = Delivery(order, uuid.uuid4().hex, now + VISIBILITY_TIMEOUT)
+                self._in_flight[order.order_id] = delivery
+                logging.debug("🔄 Dequeued Order: %s (delivery %s)", order.order_id, order.delivery_count,
+                              extra={"order_id": order.order_id})
+                return order_queue_pb2.DequeueResponse(
+                    orderId=order.order_id, found=True, receipt=delivery.receipt,
+                    deliveryCount=order.delivery_count, partition=request.partition, books=order.books
+                )
             else:
-                print("⚠️ Queue empty.")
-                return order_queue_pb2.DequeueResponse(orderId="")
+                return order_queue_pb2.DequeueResponse(orderId="", partition=request.partition)
+
+    def Ack(self, request, context):
+        with self._lock:
+            delivery = self._in_flight.get(request.orderId)
+            if delivery is None or delivery.receipt != request.receipt:
+                # Already acknowledged, or redelivered to someone else after
+                # the visibility timeout.
+                return order_queue_pb2.AckResponse(success=False, message="Unknown or expired receipt")
+            del self._in_flight[request.orderId]
+            self._pending.discard(request.orderId)
+            logging.debug("☑️ Acked Order: %s", request.orderId, extra={"order_id": request.orderId})
+            return order_queue_pb2.AckResponse(success=True)
+
+    def Nack(self, request, context):
+        with self._lock:
+            delivery = self._in_flight.get(request.orderId)
+            if delivery is None or delivery.receipt != request.receipt:
+                return order_queue_pb2.AckResponse(success=False, message="Unknown or expired receipt")
+            del self._in_flight[request.orderId]
+            self._requeue(delivery.order)
+            logging.info("↩️ Nacked Order: %s, requeued", request.orderId, extra={"order_id": request.orderId})
+            return order_queue_pb2.AckResponse(success=True)
+
+    def _requeue_expired(self, now):
+        # Caller holds self._lock.
+        expired = [order_id for order_id, d in self._in_flight.items() if d.deadline <= now]
+        for order_id in expired:
+            delivery = self._in_flight.pop(order_id)
+            self._requeue(delivery.order)
+            logging.warning("⏰ Visibility timeout for Order: %s, requeued", order_id, extra={"order_id": order_id})
+
+    def _requeue(self, order):
+        # Caller holds self._lock.
+        heapq.heappush(self._partitions[order.partition].queue, order)
 
 def serve_queue_service():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=server_options())
     order_queue_pb2_grpc.add_OrderQueueServiceServicer_to_server(OrderQueueService(), server)
     server.add_insecure_port("[::]:50056")
-    print("📦 Order Queue Service running on port 50056...")
+    logging.info("📦 Order Queue Service running on port 50056 with %s partition(s)...", NUM_PARTITIONS)
     server.start()
     server.wait_for_termination()
 
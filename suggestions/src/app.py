@@ -3,60 +3,174 @@ import os
 import grpc
 from concurrent import futures
 import threading
+import time
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - [Suggestions] %(message)s')
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 
 # Setup gRPC stub path
 FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
 suggestions_grpc_path = os.path.abspath(os.path.join(FILE, '../../../utils/pb/suggestions'))
 sys.path.insert(0, suggestions_grpc_path)
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+
+# Setup logging
+from logs import setup_logging
+setup_logging("Suggestions")
+
+from channels import server_options
 
 # Import gRPC stubs
 import suggestions_pb2 as suggestions_pb2
 import suggestions_pb2_grpc as suggestions_pb2_grpc
 
-# Constants
-BOOK_SUGGESTIONS = {
-    "Book A": ["Book C", "Book D"],
-    "Book B": ["Book E", "Book F"],
-    "Book C": ["Book A", "Book B"],
-    "Book D": ["Book E", "Book F"],
-    "Book K": ["Book G", "Book H"],
-    "Book L": ["Book I", "Book J"],
-}
-
-# Vector clock management
-lock = threading.Lock()
-vector_clocks = {}
+import embeddings
+from cache import ClockStore, SuggestionCache
+from recommender import IncrementalIndex, load_baskets, recommend
+
+# ----- Recommendation index -----
+# Built at startup from SUGGESTIONS_HISTORY (JSON lines of past orders'
+# books). Without a history file the index is seeded with the pairs that
+# used to be hard-coded here, so a fresh deployment suggests what it did before.
+# Executed orders then arrive through ObserveOrder; every
+# SUGGESTIONS_REFRESH_S the titles they touched are re-ranked and a new
+# snapshot replaces the one GetSuggestions reads.
+SEED_BASKETS = [
+    ["Book A", "Book C"], ["Book A", "Book D"],
+    ["Book B", "Book E"], ["Book B", "Book F"],
+    ["Book C", "Book A"], ["Book C", "Book B"],
+    ["Book D", "Book E"], ["Book D", "Book F"],
+    ["Book K", "Book G"], ["Book K", "Book H"],
+    ["Book L", "Book I"], ["Book L", "Book J"],
+]
+NEIGHBOURS_PER_TITLE = int(os.getenv("SUGGESTIONS_NEIGHBOURS", "20"))
+MAX_SUGGESTIONS = int(os.getenv("SUGGESTIONS_LIMIT", "4"))
+REFRESH_INTERVAL = float(os.getenv("SUGGESTIONS_REFRESH_S", "1"))
+
+# ----- Embedding backend -----
+# SUGGESTIONS_BACKEND=embedding answers from an approximate nearest-neighbour
+# search over title embeddings instead of the co-purchase lists, which also
+# finds neighbours for titles that were rarely bought together with anything.
+# Embeddings are loaded from SUGGESTIONS_EMBEDDINGS (a prefix written by
+# `python embeddings.py`) or, if it doesn't exist yet, trained from the
+# startup history and written there. They are not updated by ObserveOrder;
+# retrain offline and restart to pick up new orders.
+BACKEND = os.getenv("SUGGESTIONS_BACKEND", "cooccurrence")
+EMBEDDINGS_PATH = os.getenv("SUGGESTIONS_EMBEDDINGS", "/tmp/suggestions_embeddings")
+EMBEDDING_DIM = int(os.getenv("SUGGESTIONS_EMBEDDING_DIM", "64"))
+IVF_LISTS = int(os.getenv("SUGGESTIONS_IVF_LISTS", "0"))  # 0 = sqrt(titles)
+IVF_NPROBE = int(os.getenv("SUGGESTIONS_IVF_NPROBE", "8"))
+
+def initial_baskets():
+    path = os.getenv("SUGGESTIONS_HISTORY")
+    if path and os.path.exists(path):
+        baskets = load_baskets(path)
+        logging.info("Loaded %d past orders from %s", len(baskets), path)
+        return baskets
+    return SEED_BASKETS
+
+def embedding_recommender(baskets):
+    if not os.path.exists(EMBEDDINGS_PATH + ".npy"):
+        started = time.perf_counter()
+        titles, vectors = embeddings.train_embeddings(baskets, EMBEDDING_DIM)
+        embeddings.save(EMBEDDINGS_PATH, titles, vectors)
+        logging.info("Trained %d embeddings in %.1f s", len(titles), time.perf_counter() - started)
+    titles, vectors = embeddings.load(EMBEDDINGS_PATH)
+    index = embeddings.IVFIndex(vectors, IVF_LISTS or None, IVF_NPROBE, EMBEDDINGS_PATH + ".ivf.npy")
+    logging.info("Embedding index loaded from %s: %d titles, %d dimensions, %d lists",
+                 EMBEDDINGS_PATH, len(titles), vectors.shape[1], len(index.centroids))
+    return embeddings.EmbeddingRecommender(titles, vectors, index)
+
+# ----- Response cache -----
+# Popular carts repeat, so answers are cached per sorted cart. Entries expire
+# after SUGGESTIONS_CACHE_TTL_S and are dropped as soon as the index
+# re-ranks any title in the cart. Lookups are counted by outcome (hit, miss,
+# stale) in suggestions_cache_lookups.
+CACHE_SIZE = int(os.getenv("SUGGESTIONS_CACHE_SIZE", "10000"))
+CACHE_TTL = float(os.getenv("SUGGESTIONS_CACHE_TTL_S", "60"))
+
+resource = Resource(attributes={SERVICE_NAME: "suggestions"})
+metric_exporter = OTLPMetricExporter(endpoint="http://observability:4318/v1/metrics")
+metric_reader = PeriodicExportingMetricReader(metric_exporter)
+metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+meter = metrics.get_meter(__name__)
+cache_counter = meter.create_counter(
+    "suggestions_cache_lookups", unit="1", description="GetSuggestions cache lookups by outcome")
+
+# ----- Vector clocks -----
+# Kept per order_id from the request for SUGGESTIONS_CLOCK_TTL_S, and for at
+# most SUGGESTIONS_CLOCK_MAX_ORDERS orders, so memory stays flat however many
+# orders go through. Requests without an order_id get a fresh clock that
+# isn't stored.
 service_id = "suggestions"
+CLOCK_TTL = float(os.getenv("SUGGESTIONS_CLOCK_TTL_S", "600"))
+CLOCK_MAX_ORDERS = int(os.getenv("SUGGESTIONS_CLOCK_MAX_ORDERS", "100000"))
+vector_clocks = ClockStore(CLOCK_MAX_ORDERS, CLOCK_TTL)
 
 def increment_vc(order_id):
-    with lock:
-        vc = vector_clocks.get(order_id, {})
-        vc[service_id] = vc.get(service_id, 0) + 1
-        vector_clocks[order_id] = vc
-        return vc
+    if not order_id:
+        return {service_id: 1}
+    return vector_clocks.increment(order_id, service_id)
 
 class SuggestionsService(suggestions_pb2_grpc.SuggestionsServiceServicer):
+    def __init__(self, baskets):
+        self.index = IncrementalIndex(baskets, NEIGHBOURS_PER_TITLE)
+        logging.info("Suggestions index built: %d titles", len(self.index.snapshot.neighbours))
+        self.embeddings = embedding_recommender(baskets) if BACKEND == "embedding" else None
+        self.cache = SuggestionCache(CACHE_SIZE, CACHE_TTL)
+        meter.create_observable_gauge(
+            "suggestions_cache_entries", callbacks=[lambda options: [Observation(len(self.cache))]],
+            unit="1", description="Carts currently cached")
+        threading.Thread(target=self.refresh_loop, daemon=True).start()
+
+    def refresh_loop(self):
+        while True:
+            time.sleep(REFRESH_INTERVAL)
+            started = time.perf_counter()
+            updated = self.index.refresh()
+            if updated:
+                logging.info("Suggestions index v%d: re-ranked %d titles in %.1f ms", self.index.snapshot.version,
+                             updated, (time.perf_counter() - started) * 1000)
+
+    def suggest(self, purchased_books):
+        key = tuple(sorted(set(purchased_books)))
+        # Read the snapshot once so the cached version matches what was ranked.
+        snapshot = self.index.snapshot
+        changed = {} if self.embeddings is not None else snapshot.changed
+        suggested_books, outcome = self.cache.get(key, changed)
+        cache_counter.add(1, {"outcome": outcome})
+        if suggested_books is None:
+            if self.embeddings is not None:
+                suggested_books = self.embeddings.recommend(key, MAX_SUGGESTIONS)
+            else:
+                suggested_books = recommend(snapshot, key, MAX_SUGGESTIONS)
+            self.cache.set(key, snapshot.version, suggested_books)
+        return suggested_books
+
     def GetSuggestions(self, request, context):
-        suggested_books = set()
-        for book in request.purchased_books:
-            suggested_books.update(BOOK_SUGGESTIONS.get(book, []))
+        suggested_books = self.suggest(request.purchased_books)
 
-        order_id = context.invocation_metadata()[-1].value if context.invocation_metadata() else "unknown"
+        order_id = request.order_id
         vc = increment_vc(order_id)
 
-        logging.debug(f"[GetSuggestions] Order {order_id}, VC updated: {vc}")
+        logging.debug("[GetSuggestions] Order %s, VC updated: %s", order_id, vc, extra={"order_id": order_id})
         return suggestions_pb2.SuggestionResponse(
-            suggested_books=list(suggested_books),
+            suggested_books=suggested_books,
             vector_clock=vc
         )
 
+    def ObserveOrder(self, request, context):
+        self.index.observe(request.books)
+        return suggestions_pb2.ObserveOrderResponse(accepted=True)
+
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor())
-    suggestions_pb2_grpc.add_SuggestionsServiceServicer_to_server(SuggestionsService(), server)
+    server = grpc.server(futures.ThreadPoolExecutor(), options=server_options())
+    suggestions_pb2_grpc.add_SuggestionsServiceServicer_to_server(SuggestionsService(initial_baskets()), server)
     server.add_insecure_port("[::]:50053")
     server.start()
     logging.info("Suggestions Service running on port 50053...")
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+class SuggestionCache:
+    """LRU cache of suggestions per cart, with a TTL.
+
+    Keys are the sorted tuple of purchased titles. Each entry remembers the
+    index version it was computed from; it is stale once any title in its key
+    has had its neighbour list re-ranked in a later version, so an index
+    refresh only invalidates the carts it actually affects.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires_at, version, suggestions)
+
+    def get(self, key, changed):
+        # changed: title -> version its neighbours last changed in. Returns
+        # (suggestions or None, outcome), outcome being "hit", "miss" or "stale".
+        with self.lock:
+            entry = self.entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return None, "miss"
+            expires_at, version, suggestions = entry
+            if expires_at <= time.monotonic() or any(changed.get(title, 0) > version for title in key):
+                del self.entries[key]
+                return None, "stale"
+            self.entries.move_to_end(key)
+            return suggestions, "hit"
+
+    def set(self, key, version, suggestions):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, version, suggestions)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+class ClockStore:
+    """Per-order vector clocks, bounded in number and age.
+
+    Every update moves an order to the back and renews its expiry, so the
+    front is always the oldest entry and expired or surplus clocks are
+    dropped from there in O(1).
+    """
+
+    def __init__(self, max_orders, ttl):
+        self.max_orders = max_orders
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.clocks = OrderedDict()  # order_id -> (expires_at, {service: counter})
+
+    def increment(self, order_id, service_id):
+        # Returns a copy of the order's clock after the increment.
+        now = time.monotonic()
+        with self.lock:
+            entry = self.clocks.pop(order_id, None)
+            clock = entry[1] if entry and entry[0] > now else {}
+            clock[service_id] = clock.get(service_id, 0) + 1
+            self.clocks[order_id] = (now + self.ttl, clock)
+            while self.clocks:
+                oldest = next(iter(self.clocks.values()))
+                if oldest[0] > now and len(self.clocks) <= self.max_orders:
+                    break
+                self.clocks.popitem(last=False)
+            return dict(clock)
+
+    def __len__(self):
+        return len(self.clocks)
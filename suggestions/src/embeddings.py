@@ -0,0 +1,133 @@
+import json
+import os
+import sys
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import eigsh
+
+from recommender import co_purchase_scores
+
+# Dense title embeddings and an approximate nearest-neighbour index over them.
+#
+# Embeddings come from the top eigenvectors of S + I, where S is the
+# cosine-normalised co-purchase matrix recommender.py ranks from: v_i · v_j
+# approximates S[i, j], so titles bought together stay close, and the low
+# rank pulls together titles bought with similar books even if they were
+# never bought with each other.
+# That is what gives long-tail titles suggestions the co-purchase lists can't.
+#
+# Vectors are L2-normalised float32 rows of a .npy file opened with mmap, so
+# several workers share one copy through the page cache. IVFIndex clusters them
+# with k-means and, per query, only scans the lists of the nprobe closest
+# centroids; recall against nprobe is measured by Test/bench_suggestions_ann.py.
+#
+# Offline training:  python embeddings.py history.jsonl /data/embeddings
+
+def train_embeddings(baskets, dim=64):
+    titles, scores = co_purchase_scores(baskets)
+    if len(titles) < 3:
+        return titles, np.eye(len(titles), dtype=np.float32)
+    dim = min(dim, len(titles) - 2)
+    start = np.random.default_rng(0).random(len(titles))  # same embeddings for the same history
+    values, vectors = eigsh(scores + sparse.identity(len(titles)), k=dim, which="LA", v0=start)
+    keep = values > 0
+    vectors = (vectors[:, keep] * np.sqrt(values[keep])).astype(np.float32)
+    return titles, normalize(vectors)
+
+def normalize(vectors):
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(lengths, 1e-12)
+
+def save(prefix, titles, vectors):
+    np.save(prefix + ".npy", np.ascontiguousarray(vectors, dtype=np.float32))
+    with open(prefix + ".titles.json", "w") as f:
+        json.dump(titles, f)
+
+def load(prefix):
+    with open(prefix + ".titles.json") as f:
+        titles = json.load(f)
+    return titles, np.load(prefix + ".npy", mmap_mode="r")
+
+def kmeans(vectors, clusters, iterations=10, seed=0, sample=50000):
+    # Spherical k-means on a sample; good enough to partition for IVF.
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample:
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample, replace=False))]
+    centroids = np.array(vectors[rng.choice(len(vectors), clusters, replace=False)])
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(clusters):
+            members = vectors[assignment == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+        centroids = normalize(centroids)
+    return centroids
+
+def top_k(scores, k):
+    if len(scores) <= k:
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+class BruteForceIndex:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def search(self, query, k):
+        scores = self.vectors @ query
+        ids = top_k(scores, k)
+        return ids, scores[ids]
+
+class IVFIndex:
+    def __init__(self, vectors, lists=None, nprobe=8, path=None):
+        lists = lists or max(1, int(np.sqrt(len(vectors))))
+        self.nprobe = min(nprobe, lists)
+        self.centroids = kmeans(vectors, lists)
+        assignment = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), 65536):
+            chunk = vectors[start:start + 65536]
+            assignment[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        # Ids grouped by list; list c is ids[offsets[c]:offsets[c + 1]]. The
+        # vectors are stored in the same order so a probe reads one
+        # contiguous block instead of gathering rows; with a path that copy
+        # is memory-mapped too.
+        self.ids = np.argsort(assignment, kind="stable").astype(np.int32)
+        self.offsets = np.searchsorted(assignment[self.ids], np.arange(lists + 1))
+        self.vectors = np.ascontiguousarray(vectors[self.ids], dtype=np.float32)
+        if path:
+            np.save(path, self.vectors)
+            self.vectors = np.load(path, mmap_mode="r")
+
+    def search(self, query, k, nprobe=None):
+        probes = top_k(self.centroids @ query, nprobe or self.nprobe)
+        spans = [(self.offsets[c], self.offsets[c + 1]) for c in probes]
+        scores = np.concatenate([self.vectors[start:end] @ query for start, end in spans])
+        candidates = np.concatenate([self.ids[start:end] for start, end in spans])
+        best = top_k(scores, k)
+        return candidates[best], scores[best]
+
+class EmbeddingRecommender:
+    def __init__(self, titles, vectors, index):
+        self.titles = titles
+        self.ids = {title: i for i, title in enumerate(titles)}
+        self.vectors = vectors
+        self.index = index
+
+    def recommend(self, purchased, k):
+        ids = [self.ids[title] for title in set(purchased) if title in self.ids]
+        if not ids:
+            return []
+        query = np.asarray(self.vectors[ids], dtype=np.float32).sum(axis=0)
+        query /= max(np.linalg.norm(query), 1e-12)
+        found, _ = self.index.search(query, k + len(ids))
+        exclude = set(ids)
+        return [self.titles[i] for i in found if i not in exclude][:k]
+
+if __name__ == "__main__":
+    from recommender import load_baskets
+
+    history, prefix = sys.argv[1], sys.argv[2]
+    titles, vectors = train_embeddings(load_baskets(history), int(os.getenv("EMBEDDING_DIM", "64")))
+    save(prefix, titles, vectors)
+    print(f"Saved {len(titles)} embeddings of dimension {vectors.shape[1]} to {prefix}.npy")
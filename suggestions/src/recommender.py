@@ -0,0 +1,157 @@
+import heapq
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy import sparse
+
+# Item-item recommendations from co-purchases.
+#
+# Orders are turned into a sparse basket x title matrix B; C = BᵀB counts how
+# often two titles were bought together. Scores are cosine-normalised,
+# C[i, j] / sqrt(n_i * n_j), so bestsellers don't end up next to everything.
+# The top K neighbours of every title are computed once per build; a query
+# only merges the precomputed lists of the purchased titles.
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Read-only index; replaced as a whole, never mutated."""
+    neighbours: dict = field(default_factory=dict)  # title -> ((title, score), ...) best first
+    version: int = 0
+    changed: dict = field(default_factory=dict)  # title -> version its neighbours last changed in
+
+def load_baskets(path):
+    # JSON lines, each either a list of titles or an object with "books".
+    baskets = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                baskets.append(entry["books"] if isinstance(entry, dict) else entry)
+    return baskets
+
+def co_purchase_scores(baskets):
+    # Returns (sorted titles, csr matrix of cosine-normalised co-purchase scores).
+    titles = sorted({title for basket in baskets for title in basket})
+    index = {title: i for i, title in enumerate(titles)}
+
+    rows, cols = [], []
+    for row, basket in enumerate(baskets):
+        for title in set(basket):
+            rows.append(row)
+            cols.append(index[title])
+    purchases = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(baskets), len(titles)))
+
+    co_counts = (purchases.T @ purchases).tocsr()
+    co_counts.setdiag(0)
+    co_counts.eliminate_zeros()
+    frequency = np.asarray(purchases.sum(axis=0)).ravel()
+    norms = 1 / np.sqrt(np.maximum(frequency, 1))
+    scores = sparse.diags(norms) @ co_counts @ sparse.diags(norms)
+    return titles, scores.tocsr()
+
+def build_snapshot(baskets, k, version=1):
+    titles, scores = co_purchase_scores(baskets)
+    if not titles:
+        return Snapshot(version=version)
+
+    neighbours = {}
+    for i, title in enumerate(titles):
+        start, end = scores.indptr[i], scores.indptr[i + 1]
+        if start == end:
+            continue
+        row_scores, row_cols = scores.data[start:end], scores.indices[start:end]
+        if len(row_scores) > k:
+            # Keep everything tied with the k-th score; the sort below
+            # decides between them.
+            kth = np.partition(row_scores, len(row_scores) - k)[len(row_scores) - k]
+            top = row_scores >= kth
+            row_scores, row_cols = row_scores[top], row_cols[top]
+        # Ties broken by title so results are stable across rebuilds.
+        order = sorted(range(len(row_cols)), key=lambda n: (-row_scores[n], titles[row_cols[n]]))
+        neighbours[title] = tuple((titles[row_cols[n]], float(row_scores[n])) for n in order[:k])
+    return Snapshot(neighbours, version)
+
+def recommend(snapshot, purchased, k):
+    # Sums each candidate's score over all purchased titles, so a title close
+    # to several books in the cart ranks above one close to just one of them.
+    purchased = set(purchased)
+    totals = {}
+    for title in purchased:
+        for candidate, score in snapshot.neighbours.get(title, ()):
+            if candidate not in purchased:
+                totals[candidate] = totals.get(candidate, 0.0) + score
+    return sorted(totals, key=lambda t: (-totals[t], t))[:k]
+
+class IncrementalIndex:
+    """Co-purchase counts that take new orders one at a time.
+
+    observe() updates the counts and marks the titles whose neighbour lists
+    changed; refresh() recomputes only those lists and publishes a new
+    Snapshot by swapping one reference. Readers just use .snapshot and never
+    take the lock.
+    """
+
+    def __init__(self, baskets, k):
+        self.k = k
+        self.lock = threading.Lock()
+        self.frequency = {}  # title -> orders containing it
+        self.co_counts = {}  # title -> {title: orders containing both}
+        self.dirty = set()
+        for basket in baskets:
+            self._count(set(basket))
+        self.dirty.clear()
+        self.snapshot = build_snapshot(baskets, k)
+
+    def observe(self, books):
+        books = set(books)
+        if not books:
+            return
+        with self.lock:
+            self._count(books)
+            # A title's frequency is in the score of every pair it is part
+            # of, so its partners' lists change too.
+            for title in books:
+                self.dirty.add(title)
+                self.dirty.update(self.co_counts.get(title, ()))
+
+    def refresh(self):
+        # Returns the number of titles whose neighbours were recomputed.
+        with self.lock:
+            if not self.dirty:
+                return 0
+            dirty, self.dirty = self.dirty, set()
+            updated = {title: self._top_k(title) for title in dirty}
+        version = self.snapshot.version + 1
+        neighbours = dict(self.snapshot.neighbours)
+        changed = dict(self.snapshot.changed)
+        for title, top in updated.items():
+            if top:
+                neighbours[title] = top
+            else:
+                neighbours.pop(title, None)
+            changed[title] = version
+        self.snapshot = Snapshot(neighbours, version, changed)
+        return len(dirty)
+
+    def _count(self, books):
+        # Caller holds self.lock (or is the constructor).
+        for title in books:
+            self.frequency[title] = self.frequency.get(title, 0) + 1
+            pairs = self.co_counts.setdefault(title, {})
+            for other in books:
+                if other != title:
+                    pairs[other] = pairs.get(other, 0) + 1
+
+    def _top_k(self, title):
+        # Caller holds self.lock.
+        frequency = self.frequency
+        norm = math.sqrt(frequency[title])
+        scored = ((count / (norm * math.sqrt(frequency[other])), other)
+                  for other, count in self.co_counts.get(title, {}).items())
+        top = heapq.nsmallest(self.k, scored, key=lambda entry: (-entry[0], entry[1]))
+        return tuple((other, score) for score, other in top)
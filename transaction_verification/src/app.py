@@ -3,11 +3,21 @@ import os
 import grpc
 from concurrent import futures
 import threading
+import logging
 #all clear
 # Import the gRPC stubs (update path only if needed)
 FILE = __file__ if '__file__' in globals() else os.getenv("PYTHONFILE", "")
 transaction_verification_grpc_path = os.path.abspath(os.path.join(FILE, '../../../utils/pb/transaction_verification'))
 sys.path.insert(0, transaction_verification_grpc_path)
+sys.path.insert(0, os.path.abspath(os.path.join(FILE, '../../../utils/common')))
+
+# Setup logging
+from logs import setup_logging
+setup_logging("TransactionVerification")
+
+from channels import server_options
+from batching import LockedCalls
+from cards import BinIndex, CardValidator
 
 import transaction_verification_pb2 as transaction_pb2
 import transaction_verification_pb2_grpc as transaction_pb2_grpc
@@ -18,6 +28,12 @@ vector_clocks = {}
 lock = threading.Lock()
 service_id = "transaction_verification"
 
+# ----- Card validation -----
+# TRANSACTION_BINS: CSV of BIN ranges per card scheme, see cards.py.
+BINS_PATH = os.getenv("TRANSACTION_BINS", os.path.join(os.path.dirname(os.path.abspath(FILE)), "bins.csv"))
+card_validator = CardValidator(BinIndex.load(BINS_PATH))
+logging.info("Loaded %d BIN ranges from %s", len(card_validator.bins), BINS_PATH)
+
 # Vector Clock Utility
 def increment_vc(vc, service_id):
     vc = vc.copy()
@@ -30,115 +46,143 @@ def compare_vcs(local_vc, remote_vc):
             return False
     return True
 
+# Handler bodies below run with `lock` held, through `locked`; with
+# RPC_BATCHING=1 concurrent requests share one acquisition (utils/common/batching.py).
+locked = LockedCalls(lock, name="transaction_verification")
+
 class TransactionVerificationService(transaction_pb2_grpc.TransactionVerificationServiceServicer):
     def InitOrder(self, request, context):
-        with lock:
-            order_data_store[request.order_id] = {
-                "user_data": request.user_data,
-                "books": request.books,
-                "credit_card": request.credit_card
-            }
-            vector_clocks[request.order_id] = {service_id: 1}
-            print(f"[InitOrder] Order {request.order_id} initialized with VC: {vector_clocks[request.order_id]}")
+        return locked(self.init_order, request)
+
+    def CheckBooks(self, request, context):
+        return locked(self.check_books, request)
+
+    def CheckUserFields(self, request, context):
+        return locked(self.check_user_fields, request)
+
+    def CheckCardFormat(self, request, context):
+        return locked(self.check_card_format, request)
+
+    def ClearOrder(self, request, context):
+        return locked(self.clear_order, request)
+
+    def init_order(self, request):
+        if request.order_id in order_data_store:
+            # A retried InitOrder whose first attempt got through; starting
+            # over would reset a vector clock the checks may have advanced.
             return transaction_pb2.InitOrderResponse(
                 success=True,
-                message="Order initialized",
+                message="Order already initialized",
                 vector_clock=vector_clocks[request.order_id]
             )
+        order_data_store[request.order_id] = {
+            "user_data": request.user_data,
+            "books": request.books,
+            "credit_card": request.credit_card,
+            "expiration_date": request.expiration_date,
+            "cvv": request.cvv
+        }
+        vector_clocks[request.order_id] = {service_id: 1}
+        logging.debug("[InitOrder] Order %s initialized with VC: %s", request.order_id,
+                      vector_clocks[request.order_id], extra={"order_id": request.order_id})
+        return transaction_pb2.InitOrderResponse(
+            success=True,
+            message="Order initialized",
+            vector_clock=vector_clocks[request.order_id]
+        )
+
+    def check_books(self, request):
+        order = order_data_store.get(request.order_id)
+        if not order:
+            return transaction_pb2.EventResponse(
+                is_success=False, message="Order not found", vector_clock={}
+            )
 
-    def CheckBooks(self, request, context):
-        with lock:
-            order = order_data_store.get(request.order_id)
-            if not order:
-                return transaction_pb2.EventResponse(
-                    is_success=False, message="Order not found", vector_clock={}
-                )
-
-            books = order["books"]
-            vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
-            if not books:
-                return transaction_pb2.EventResponse(
-                    is_success=False,
-                    message="Book list is empty",
-                    vector_clock=vector_clocks[request.order_id]
-                )
-
-            print(f"[CheckBooks] Order {request.order_id} passed book check.")
+        books = order["books"]
+        vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
+        if not books:
             return transaction_pb2.EventResponse(
-                is_success=True,
-                message="Books are valid",
+                is_success=False,
+                message="Book list is empty",
                 vector_clock=vector_clocks[request.order_id]
             )
 
-    def CheckUserFields(self, request, context):
-        with lock:
-            order = order_data_store.get(request.order_id)
-            if not order:
-                return transaction_pb2.EventResponse(
-                    is_success=False, message="Order not found", vector_clock={}
-                )
-
-            user_data = order["user_data"]
-            vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
-            required_fields = ["name", "contact", "address"]
+        logging.debug("[CheckBooks] Order %s passed book check.", request.order_id, extra={"order_id": request.order_id})
+        return transaction_pb2.EventResponse(
+            is_success=True,
+            message="Books are valid",
+            vector_clock=vector_clocks[request.order_id]
+        )
 
-            for field in required_fields:
-                if not user_data.get(field):
-                    return transaction_pb2.EventResponse(
-                        is_success=False,
-                        message=f"Missing required user field: {field}",
-                        vector_clock=vector_clocks[request.order_id]
-                    )
-
-            print(f"[CheckUserFields] Order {request.order_id} passed user field check.")
+    def check_user_fields(self, request):
+        order = order_data_store.get(request.order_id)
+        if not order:
             return transaction_pb2.EventResponse(
-                is_success=True,
-                message="All user fields are valid",
-                vector_clock=vector_clocks[request.order_id]
+                is_success=False, message="Order not found", vector_clock={}
             )
 
-    def CheckCardFormat(self, request, context):
-        with lock:
-            order = order_data_store.get(request.order_id)
-            if not order:
-                return transaction_pb2.EventResponse(
-                    is_success=False, message="Order not found", vector_clock={}
-                )
+        user_data = order["user_data"]
+        vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
+        required_fields = ["name", "contact", "address"]
 
-            card = order["credit_card"]
-            vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
-            if not card or len(card) != 16 or not card.isdigit():
+        for field in required_fields:
+            if not user_data.get(field):
                 return transaction_pb2.EventResponse(
                     is_success=False,
-                    message="Invalid credit card format",
+                    message=f"Missing required user field: {field}",
                     vector_clock=vector_clocks[request.order_id]
                 )
 
-            print(f"[CheckCardFormat] Order {request.order_id} passed credit card format check.")
+        logging.debug("[CheckUserFields] Order %s passed user field check.", request.order_id,
+                      extra={"order_id": request.order_id})
+        return transaction_pb2.EventResponse(
+            is_success=True,
+            message="All user fields are valid",
+            vector_clock=vector_clocks[request.order_id]
+        )
+
+    def check_card_format(self, request):
+        order = order_data_store.get(request.order_id)
+        if not order:
             return transaction_pb2.EventResponse(
-                is_success=True,
-                message="Credit card format is valid",
+                is_success=False, message="Order not found", vector_clock={}
+            )
+
+        vector_clocks[request.order_id] = increment_vc(vector_clocks[request.order_id], service_id)
+        reason = card_validator.check(order["credit_card"], order["expiration_date"], order["cvv"])
+        if reason:
+            return transaction_pb2.EventResponse(
+                is_success=False,
+                message=reason,
                 vector_clock=vector_clocks[request.order_id]
             )
 
-    def ClearOrder(self, request, context):
-        with lock:
-            local_vc = vector_clocks.get(request.order_id, {})
-            if compare_vcs(local_vc, request.final_vector_clock):
-                order_data_store.pop(request.order_id, None)
-                vector_clocks.pop(request.order_id, None)
-                print(f"[ClearOrder] Order {request.order_id} cleared successfully.")
-                return transaction_pb2.ClearOrderResponse(status="Cleared")
-            else:
-                print(f"[ClearOrder] Order {request.order_id} NOT cleared. Local VC: {local_vc}, Final VC: {request.final_vector_clock}")
-                return transaction_pb2.ClearOrderResponse(status="Vector clock mismatch - not cleared.")
+        logging.debug("[CheckCardFormat] Order %s passed credit card check.", request.order_id,
+                      extra={"order_id": request.order_id})
+        return transaction_pb2.EventResponse(
+            is_success=True,
+            message="Credit card is valid",
+            vector_clock=vector_clocks[request.order_id]
+        )
+
+    def clear_order(self, request):
+        local_vc = vector_clocks.get(request.order_id, {})
+        if compare_vcs(local_vc, request.final_vector_clock):
+            order_data_store.pop(request.order_id, None)
+            vector_clocks.pop(request.order_id, None)
+            logging.debug("[ClearOrder] Order %s cleared successfully.", request.order_id, extra={"order_id": request.order_id})
+            return transaction_pb2.ClearOrderResponse(status="Cleared")
+        else:
+            logging.warning("[ClearOrder] Order %s NOT cleared. Local VC: %s, Final VC: %s", request.order_id,
+                            local_vc, dict(request.final_vector_clock))
+            return transaction_pb2.ClearOrderResponse(status="Vector clock mismatch - not cleared.")
 
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor())
+    server = grpc.server(futures.ThreadPoolExecutor(), options=server_options())
     transaction_pb2_grpc.add_TransactionVerificationServiceServicer_to_server(TransactionVerificationService(), server)
     server.add_insecure_port("[::]:50052")
     server.start()
-    print("Transaction Verification Service running on port 50052....")
+    logging.info("Transaction Verification Service running on port 50052....")
     server.wait_for_termination()
 
 if __name__ == "__main__":
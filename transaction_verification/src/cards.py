@@ -0,0 +1,188 @@
+import bisect
+import calendar
+import csv
+import time
+
+# Credit card validation for CheckCardFormat.
+#
+# A card passes when its number has a valid Luhn checksum, starts with a
+# known BIN (the leading digits that identify the scheme), has a length that
+# scheme issues, hasn't expired, and comes with a CVV of the scheme's length.
+#
+# Everything that can be worked out ahead of time is, so a check is a handful
+# of slices and dict/set lookups with no per-digit Python work:
+#   Luhn    the checksum contribution of every 1-4 digit group, so a 16 digit
+#           number is four lookups
+#   BIN     the range table, flattened into sorted non-overlapping ranges of
+#           8 digit prefixes searched with bisect, and fronted by a dict of the
+#           4 digit prefixes that lie entirely inside one range (or none)
+#   expiry  every accepted "MM/YY" and "MM/YYYY" string from this month to
+#           max_years ahead, rebuilt when the month rolls over (UTC)
+#   CVV     every 3 and 4 digit string
+#
+# The BIN table is a CSV with columns low,high,scheme,lengths,cvv_length:
+# low/high are prefixes of up to 8 digits (high inclusive, so "51","55"
+# covers 51xxxx-55xxxx), lengths is e.g. "16", "13 16 19" or "16-19".
+# Ranges may nest, and the narrowest one wins; partial overlaps are rejected.
+
+PREFIX = 8
+LENGTHS = range(12, 20)
+MAX_YEARS = 20
+
+# ----- Luhn -----
+
+def _group_sum(digits):
+    # Luhn contribution of a group whose last digit is not doubled.
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        digit = int(digit)
+        total += (digit * 2 - 9 if digit > 4 else digit * 2) if position & 1 else digit
+    return total
+
+_LUHN = {f"{v:0{w}d}": _group_sum(f"{v:0{w}d}") for w in range(1, 5) for v in range(10 ** w)}
+# Groups are cut from the right end, so each one ends on an undoubled digit.
+_GROUPS = {n: tuple([slice(0, n % 4)] * (n % 4 > 0) + [slice(i, i + 4) for i in range(n % 4, n, 4)])
+           for n in LENGTHS}
+
+def luhn_valid(number):
+    try:
+        total = 0
+        for group in _GROUPS[len(number)]:
+            total += _LUHN[number[group]]
+    except KeyError:  # unsupported length or not ASCII digits
+        return False
+    return total % 10 == 0
+
+# ----- BIN index -----
+
+_CVVS = {n: frozenset(f"{v:0{n}d}" for v in range(10 ** n)) for n in (3, 4)}
+
+class Scheme:
+    __slots__ = ("name", "lengths", "cvvs")
+
+    def __init__(self, name, lengths, cvv_length):
+        self.name = name
+        self.lengths = frozenset(lengths)
+        self.cvvs = _CVVS[cvv_length]
+
+def _parse_lengths(text):
+    lengths = set()
+    for part in text.split():
+        low, _, high = part.partition("-")
+        lengths.update(range(int(low), int(high or low) + 1))
+    return lengths
+
+_PARTIAL = object()
+
+class BinIndex:
+    def __init__(self, ranges):
+        # ranges: (low prefix, high prefix, Scheme)
+        spans = []
+        for low, high, scheme in ranges:
+            if not (low.isdigit() and high.isdigit() and len(low) <= PREFIX and len(high) <= PREFIX):
+                raise ValueError(f"bad BIN range {low}-{high}")
+            low, high = int(low.ljust(PREFIX, "0")), int(high.ljust(PREFIX, "9"))
+            if low > high:
+                raise ValueError(f"empty BIN range {low}-{high}")
+            spans.append((low, -high, scheme))
+        spans.sort(key=lambda span: span[:2])
+
+        # Sweep in order of start, keeping the ranges that enclose the current
+        # position on a stack; the top one owns everything until the next range
+        # starts or it ends.
+        segments, stack, position = [], [], 0
+        def emit(end, scheme):
+            if position <= end:
+                segments.append((position, end, scheme))
+            return max(position, end + 1)
+        for low, high, scheme in spans:
+            high = -high
+            while stack and stack[-1][0] < low:
+                end, outer, _ = stack.pop()
+                position = emit(end, outer)
+            if stack:
+                if high > stack[-1][0] or (low, high) == (stack[-1][2], stack[-1][0]):
+                    raise ValueError(f"BIN range {low:0{PREFIX}d}-{high:0{PREFIX}d} overlaps another")
+                position = emit(low - 1, stack[-1][1])
+            position = low
+            stack.append((high, scheme, low))
+        while stack:
+            end, outer, _ = stack.pop()
+            position = emit(end, outer)
+
+        self.starts = [f"{start:0{PREFIX}d}" for start, _, _ in segments]
+        self.ends = [f"{end:0{PREFIX}d}" for _, end, _ in segments]
+        self.schemes = [scheme for _, _, scheme in segments]
+        self.blocks = {}  # 4 digit prefix -> Scheme, or None if no range starts with it
+        for block in range(10 ** 4):
+            head = f"{block:04d}"
+            first, last = head.ljust(PREFIX, "0"), head.ljust(PREFIX, "9")
+            i = bisect.bisect_right(self.starts, last) - 1
+            if i < 0 or self.ends[i] < first:
+                self.blocks[head] = None
+            elif self.starts[i] <= first and self.ends[i] >= last:
+                self.blocks[head] = self.schemes[i]
+
+    @classmethod
+    def load(cls, path):
+        schemes = {}
+        ranges = []
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                key = (row["scheme"], row["lengths"], row["cvv_length"])
+                if key not in schemes:
+                    schemes[key] = Scheme(row["scheme"], _parse_lengths(row["lengths"]), int(row["cvv_length"]))
+                ranges.append((row["low"].strip(), row["high"].strip(), schemes[key]))
+        return cls(ranges)
+
+    def lookup(self, number):
+        # Scheme for a card number of at least PREFIX digits, or None.
+        scheme = self.blocks.get(number[:4], _PARTIAL)
+        if scheme is not _PARTIAL:
+            return scheme
+        prefix = number[:PREFIX]
+        i = bisect.bisect_right(self.starts, prefix) - 1
+        if i >= 0 and prefix <= self.ends[i]:
+            return self.schemes[i]
+        return None
+
+    def __len__(self):
+        return len(self.starts)
+
+# ----- Validator -----
+
+class CardValidator:
+    def __init__(self, bins, max_years=MAX_YEARS):
+        self.bins = bins
+        self.max_years = max_years
+        self.expiries = frozenset()
+        self.rollover = float("-inf")
+
+    def _refresh(self, now):
+        today = time.gmtime(now)
+        expiries = set()
+        for ahead in range(12 * self.max_years + 1):
+            year, month = divmod(today.tm_year * 12 + today.tm_mon - 1 + ahead, 12)
+            expiries.add(f"{month + 1:02d}/{year % 100:02d}")
+            expiries.add(f"{month + 1:02d}/{year}")
+        year, month = divmod(today.tm_year * 12 + today.tm_mon, 12)
+        self.expiries = frozenset(expiries)
+        self.rollover = calendar.timegm((year, month + 1, 1, 0, 0, 0))
+
+    def check(self, number, expiration, cvv, now=None):
+        # Returns None if the card is valid, else the reason it isn't.
+        now = time.time() if now is None else now
+        if now >= self.rollover:
+            self._refresh(now)
+        if not luhn_valid(number):
+            return "Invalid credit card number"
+        scheme = self.bins.lookup(number)
+        if scheme is None:
+            return "Unknown card issuer"
+        if len(number) not in scheme.lengths:
+            return f"Invalid card number length for {scheme.name}"
+        if expiration not in self.expiries:
+            return "Card expired or invalid expiration date"
+        if cvv not in scheme.cvvs:
+            return "Invalid CVV"
+        return None
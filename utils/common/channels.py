@@ -0,0 +1,136 @@
+import itertools
+import os
+import threading
+
+import grpc
+
+# Shared gRPC channel factory.
+#
+#   GRPC_KEEPALIVE_MS    client ping interval while calls are active (default 20000)
+#   GRPC_MAX_MESSAGE_MB  send/receive limit on clients and servers (default 16)
+#   GRPC_COMPRESSION     none (default), gzip or deflate
+#   GRPC_SUBCHANNELS     connections per target (default 1)
+#
+# Channels are cached per target and settings for the life of the process,
+# so every stub for a target shares its connections. With subchannels > 1
+# the target gets that many TCP connections and calls are spread over them
+# round-robin, which helps when one HTTP/2 connection's stream limit or a
+# single server thread reading it becomes the bottleneck.
+
+KEEPALIVE_MS = int(os.getenv("GRPC_KEEPALIVE_MS", "20000"))
+MAX_MESSAGE_BYTES = int(float(os.getenv("GRPC_MAX_MESSAGE_MB", "16")) * 1024 * 1024)
+DEFAULT_SUBCHANNELS = int(os.getenv("GRPC_SUBCHANNELS", "1"))
+
+_COMPRESSION = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+COMPRESSION = _COMPRESSION[os.getenv("GRPC_COMPRESSION", "none").lower()]
+
+def channel_options(extra=()):
+    options = [
+        ("grpc.keepalive_time_ms", KEEPALIVE_MS),
+        ("grpc.keepalive_timeout_ms", 5000),
+        # Only ping while calls are in flight; idle pings get a GOAWAY from
+        # servers that don't set server_options().
+        ("grpc.keepalive_permit_without_calls", 0),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+        ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+        # Reconnect quickly after a peer restarts instead of backing off to 120 s.
+        ("grpc.initial_reconnect_backoff_ms", 200),
+        ("grpc.max_reconnect_backoff_ms", 5000),
+    ]
+    options.extend(extra)
+    return options
+
+def server_options():
+    """Options for grpc.server() matching the clients' keepalive and size limits."""
+    return [
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.min_ping_interval_without_data_ms", min(KEEPALIVE_MS, 10000)),
+        ("grpc.http2.max_ping_strikes", 0),
+        ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+        ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+    ]
+
+class _RoundRobinMultiCallable:
+    def __init__(self, callables):
+        self._callables = callables
+        self._next = itertools.cycle(callables).__next__
+
+    def __call__(self, *args, **kwargs):
+        return self._next()(*args, **kwargs)
+
+    def future(self, *args, **kwargs):
+        return self._next().future(*args, **kwargs)
+
+    def with_call(self, *args, **kwargs):
+        return self._next().with_call(*args, **kwargs)
+
+class RoundRobinChannel(grpc.Channel):
+    """Spreads calls over several channels to the same target, one call at a time."""
+
+    def __init__(self, channels):
+        self._channels = channels
+
+    def unary_unary(self, *args, **kwargs):
+        return _RoundRobinMultiCallable([c.unary_unary(*args, **kwargs) for c in self._channels])
+
+    def unary_stream(self, *args, **kwargs):
+        return _RoundRobinMultiCallable([c.unary_stream(*args, **kwargs) for c in self._channels])
+
+    def stream_unary(self, *args, **kwargs):
+        return _RoundRobinMultiCallable([c.stream_unary(*args, **kwargs) for c in self._channels])
+
+    def stream_stream(self, *args, **kwargs):
+        return _RoundRobinMultiCallable([c.stream_stream(*args, **kwargs) for c in self._channels])
+
+    def subscribe(self, callback, try_to_connect=False):
+        for channel in self._channels:
+            channel.subscribe(callback, try_to_connect)
+
+    def unsubscribe(self, callback):
+        for channel in self._channels:
+            channel.unsubscribe(callback)
+
+    def close(self):
+        for channel in self._channels:
+            channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+_lock = threading.Lock()
+_channels = {}  # (target, subchannels, extra options) -> channel
+
+def get_channel(target, subchannels=None, options=()):
+    """Returns the shared channel for target, creating it on first use."""
+    subchannels = subchannels or DEFAULT_SUBCHANNELS
+    key = (target, subchannels, tuple(options))
+    with _lock:
+        channel = _channels.get(key)
+        if channel is None:
+            if subchannels == 1:
+                channel = grpc.insecure_channel(target, options=channel_options(options), compression=COMPRESSION)
+            else:
+                # A local subchannel pool stops gRPC from folding channels
+                # with identical arguments onto one connection.
+                channel = RoundRobinChannel([
+                    grpc.insecure_channel(
+                        target, options=channel_options([*options, ("grpc.use_local_subchannel_pool", 1)]),
+                        compression=COMPRESSION)
+                    for _ in range(subchannels)
+                ])
+            _channels[key] = channel
+        return channel
+
+def get_aio_channel(target, options=()):
+    # grpc.aio channels belong to the event loop that made them, so they are
+    # not pooled here; callers keep one per loop.
+    return grpc.aio.insecure_channel(target, options=channel_options(options), compression=COMPRESSION)
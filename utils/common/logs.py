@@ -0,0 +1,106 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import zlib
+
+# Shared logging setup for the services.
+#
+#   LOG_LEVEL        root level (default INFO)
+#   LOG_FORMAT       "text" (default) or "json", one object per line
+#   LOG_SAMPLE_RATE  share of orders whose DEBUG records are kept (default 0.1)
+#
+# Callers log with %-style arguments so nothing is formatted for records
+# below LOG_LEVEL. Records go through a QueueHandler, so formatting and the
+# write to stdout happen on a listener thread instead of inside request
+# handlers (and their locks). Per-order DEBUG records pass
+# extra={"order_id": ...}; whether an order is sampled is a hash of its id,
+# so every service keeps or drops the same orders.
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - [{service}] %(message)s'
+
+# Argument types that can't change between the log call and the listener
+# formatting the record. Anything else is formatted in the calling thread.
+_IMMUTABLE = (str, int, float, bool, type(None), bytes, tuple)
+
+class SamplingFilter(logging.Filter):
+    """Drops DEBUG records tagged with an order_id unless that order is sampled."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.threshold = int(rate * 0x100000000)
+
+    def filter(self, record):
+        order_id = getattr(record, "order_id", None)
+        if order_id is None or record.levelno > logging.DEBUG:
+            return True
+        return is_sampled(order_id, self.threshold)
+
+def is_sampled(order_id, threshold):
+    return zlib.crc32(str(order_id).encode()) < threshold
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    # The stock prepare() formats every record so it can be pickled; an
+    # in-process queue doesn't need that, so formatting is left to the
+    # listener unless an argument is mutable.
+    def prepare(self, record):
+        if record.args and not all(isinstance(arg, _IMMUTABLE) for arg in
+                                   (record.args.values() if isinstance(record.args, dict) else record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "service": self.service,
+            "msg": record.getMessage(),
+        }
+        order_id = getattr(record, "order_id", None)
+        if order_id is not None:
+            entry["order_id"] = order_id
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def setup_logging(service, level=None):
+    """Configures the root logger for a service and returns its listener."""
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+
+    stream = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "text") == "json":
+        stream.setFormatter(JsonFormatter(service))
+    else:
+        stream.setFormatter(logging.Formatter(TEXT_FORMAT.format(service=service)))
+
+    handler = _LocalQueueHandler(queue.SimpleQueue())
+    handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener = _Listener(handler.queue, stream, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+class _Listener(logging.handlers.QueueListener):
+    def stop(self):
+        # Flushes what's queued; safe to call more than once.
+        if self._thread is not None:
+            super().stop()
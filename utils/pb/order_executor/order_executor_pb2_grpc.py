@@ -24,6 +24,11 @@ class OrderExecutorServiceStub(object):
                 request_serializer=order__executor_dot_order__executor__pb2.LeaderAnnouncement.SerializeToString,
                 response_deserializer=order__executor_dot_order__executor__pb2.Ack.FromString,
                 )
+        self.Heartbeat = channel.unary_unary(
+                '/order_executor.OrderExecutorService/Heartbeat',
+                request_serializer=order__executor_dot_order__executor__pb2.HeartbeatRequest.SerializeToString,
+                response_deserializer=order__executor_dot_order__executor__pb2.HeartbeatResponse.FromString,
+                )
         self.DequeueOrder = channel.unary_unary(
                 '/order_executor.OrderExecutorService/DequeueOrder',
                 request_serializer=order__executor_dot_order__executor__pb2.OrderRequest.SerializeToString,
@@ -48,6 +53,13 @@ class OrderExecutorServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Heartbeat(self, request, context):
+        """Sent periodically by the leader to keep followers from starting an election
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def DequeueOrder(self, request, context):
         """Called by the leader to dequeue and process an order
         """
@@ -68,6 +80,11 @@ def add_OrderExecutorServiceServicer_to_server(servicer, server):
                     request_deserializer=order__executor_dot_order__executor__pb2.LeaderAnnouncement.FromString,
                     response_serializer=order__executor_dot_order__executor__pb2.Ack.SerializeToString,
             ),
+            'Heartbeat': grpc.unary_unary_rpc_method_handler(
+                    servicer.Heartbeat,
+                    request_deserializer=order__executor_dot_order__executor__pb2.HeartbeatRequest.FromString,
+                    response_serializer=order__executor_dot_order__executor__pb2.HeartbeatResponse.SerializeToString,
+            ),
             'DequeueOrder': grpc.unary_unary_rpc_method_handler(
                     servicer.DequeueOrder,
                     request_deserializer=order__executor_dot_order__executor__pb2.OrderRequest.FromString,
@@ -117,6 +134,23 @@ class OrderExecutorService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def Heartbeat(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/order_executor.OrderExecutorService/Heartbeat',
+            order__executor_dot_order__executor__pb2.HeartbeatRequest.SerializeToString,
+            order__executor_dot_order__executor__pb2.HeartbeatResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def DequeueOrder(request,
             target,
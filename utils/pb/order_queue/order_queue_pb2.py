@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: order_queue/order_queue.proto
+# Protobuf Python Version: 4.25.0
 """Generated protocol buffer code."""
-from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -13,23 +14,35 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dorder_queue/order_queue.proto\x12\x0border_queue\"T\n\x0cOrderRequest\x12\x0f\n\x07orderId\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x02\x12\x11\n\titemCount\x18\x03 \x01(\x05\x12\x10\n\x08userType\x18\x04 \x01(\t\"2\n\rOrderResponse\x12\x10\n\x08order_id\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\"3\n\x0f\x45nqueueResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x07\n\x05\x45mpty\"1\n\x0f\x44\x65queueResponse\x12\x0f\n\x07orderId\x18\x01 \x01(\t\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x32\x94\x01\n\x11OrderQueueService\x12\x42\n\x07\x45nqueue\x12\x19.order_queue.OrderRequest\x1a\x1c.order_queue.EnqueueResponse\x12;\n\x07\x44\x65queue\x12\x12.order_queue.Empty\x1a\x1c.order_queue.DequeueResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dorder_queue/order_queue.proto\x12\x0border_queue\"c\n\x0cOrderRequest\x12\x0f\n\x07orderId\x18\x01 \x01(\t\x12\x0e\n\x06\x61mount\x18\x02 \x01(\x02\x12\x11\n\titemCount\x18\x03 \x01(\x05\x12\x10\n\x08userType\x18\x04 \x01(\t\x12\r\n\x05\x62ooks\x18\x05 \x03(\t\"2\n\rOrderResponse\x12\x10\n\x08order_id\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\"3\n\x0f\x45nqueueResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x07\n\x05\x45mpty\"^\n\x0cLeaseRequest\x12\x11\n\tholder_id\x18\x01 \x01(\x05\x12\x0c\n\x04term\x18\x02 \x01(\x03\x12\x11\n\tpartition\x18\x03 \x01(\x05\x12\x1a\n\x12\x61ssignment_version\x18\x04 \x01(\x03\"p\n\rLeaseResponse\x12\x0f\n\x07granted\x18\x01 \x01(\x08\x12\x15\n\rfencing_token\x18\x02 \x01(\x03\x12\x10\n\x08lease_ms\x18\x03 \x01(\x05\x12\x11\n\tholder_id\x18\x04 \x01(\x05\x12\x12\n\npartitions\x18\x05 \x01(\x05\"(\n\x12PartitionsResponse\x12\x12\n\npartitions\x18\x01 \x01(\x05\":\n\x0e\x44\x65queueRequest\x12\x15\n\rfencing_token\x18\x01 \x01(\x03\x12\x11\n\tpartition\x18\x02 \x01(\x05\"{\n\x0f\x44\x65queueResponse\x12\x0f\n\x07orderId\x18\x01 \x01(\t\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12\x0f\n\x07receipt\x18\x03 \x01(\t\x12\x15\n\rdeliveryCount\x18\x04 \x01(\x05\x12\x11\n\tpartition\x18\x05 \x01(\x05\x12\r\n\x05\x62ooks\x18\x06 \x03(\t\".\n\nAckRequest\x12\x0f\n\x07orderId\x18\x01 \x01(\t\x12\x0f\n\x07receipt\x18\x02 \x01(\t\"/\n\x0b\x41\x63kResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t2\x9f\x03\n\x11OrderQueueService\x12\x42\n\x07\x45nqueue\x12\x19.order_queue.OrderRequest\x1a\x1c.order_queue.EnqueueResponse\x12\x45\n\x0c\x41\x63quireLease\x12\x19.order_queue.LeaseRequest\x1a\x1a.order_queue.LeaseResponse\x12\x44\n\x07\x44\x65queue\x12\x1b.order_queue.DequeueRequest\x1a\x1c.order_queue.DequeueResponse\x12\x38\n\x03\x41\x63k\x12\x17.order_queue.AckRequest\x1a\x18.order_queue.AckResponse\x12\x39\n\x04Nack\x12\x17.order_queue.AckRequest\x1a\x18.order_queue.AckResponse\x12\x44\n\rGetPartitions\x12\x12.order_queue.Empty\x1a\x1f.order_queue.PartitionsResponseb\x06proto3')
 
-_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
-_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'order_queue.order_queue_pb2', globals())
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'order_queue.order_queue_pb2', _globals)
 if _descriptor._USE_C_DESCRIPTORS == False:
-
   DESCRIPTOR._options = None
-  _ORDERREQUEST._serialized_start=46
-  _ORDERREQUEST._serialized_end=130
-  _ORDERRESPONSE._serialized_start=132
-  _ORDERRESPONSE._serialized_end=182
-  _ENQUEUERESPONSE._serialized_start=184
-  _ENQUEUERESPONSE._serialized_end=235
-  _EMPTY._serialized_start=237
-  _EMPTY._serialized_end=244
-  _DEQUEUERESPONSE._serialized_start=246
-  _DEQUEUERESPONSE._serialized_end=295
-  _ORDERQUEUESERVICE._serialized_start=298
-  _ORDERQUEUESERVICE._serialized_end=446
+  _globals['_ORDERREQUEST']._serialized_start=46
+  _globals['_ORDERREQUEST']._serialized_end=145
+  _globals['_ORDERRESPONSE']._serialized_start=147
+  _globals['_ORDERRESPONSE']._serialized_end=197
+  _globals['_ENQUEUERESPONSE']._serialized_start=199
+  _globals['_ENQUEUERESPONSE']._serialized_end=250
+  _globals['_EMPTY']._serialized_start=252
+  _globals['_EMPTY']._serialized_end=259
+  _globals['_LEASEREQUEST']._serialized_start=261
+  _globals['_LEASEREQUEST']._serialized_end=355
+  _globals['_LEASERESPONSE']._serialized_start=357
+  _globals['_LEASERESPONSE']._serialized_end=469
+  _globals['_PARTITIONSRESPONSE']._serialized_start=471
+  _globals['_PARTITIONSRESPONSE']._serialized_end=511
+  _globals['_DEQUEUEREQUEST']._serialized_start=513
+  _globals['_DEQUEUEREQUEST']._serialized_end=571
+  _globals['_DEQUEUERESPONSE']._serialized_start=573
+  _globals['_DEQUEUERESPONSE']._serialized_end=696
+  _globals['_ACKREQUEST']._serialized_start=698
+  _globals['_ACKREQUEST']._serialized_end=744
+  _globals['_ACKRESPONSE']._serialized_start=746
+  _globals['_ACKRESPONSE']._serialized_end=793
+  _globals['_ORDERQUEUESERVICE']._serialized_start=796
+  _globals['_ORDERQUEUESERVICE']._serialized_end=1211
 # @@protoc_insertion_point(module_scope)
@@ -19,11 +19,31 @@ class OrderQueueServiceStub(object):
                 request_serializer=order__queue_dot_order__queue__pb2.OrderRequest.SerializeToString,
                 response_deserializer=order__queue_dot_order__queue__pb2.EnqueueResponse.FromString,
                 )
+        self.AcquireLease = channel.unary_unary(
+                '/order_queue.OrderQueueService/AcquireLease',
+                request_serializer=order__queue_dot_order__queue__pb2.LeaseRequest.SerializeToString,
+                response_deserializer=order__queue_dot_order__queue__pb2.LeaseResponse.FromString,
+                )
         self.Dequeue = channel.unary_unary(
                 '/order_queue.OrderQueueService/Dequeue',
-                request_serializer=order__queue_dot_order__queue__pb2.Empty.SerializeToString,
+                request_serializer=order__queue_dot_order__queue__pb2.DequeueRequest.SerializeToString,
                 response_deserializer=order__queue_dot_order__queue__pb2.DequeueResponse.FromString,
                 )
+        self.Ack = channel.unary_unary(
+                '/order_queue.OrderQueueService/Ack',
+                request_serializer=order__queue_dot_order__queue__pb2.AckRequest.SerializeToString,
+                response_deserializer=order__queue_dot_order__queue__pb2.AckResponse.FromString,
+                )
+        self.Nack = channel.unary_unary(
+                '/order_queue.OrderQueueService/Nack',
+                request_serializer=order__queue_dot_order__queue__pb2.AckRequest.SerializeToString,
+                response_deserializer=order__queue_dot_order__queue__pb2.AckResponse.FromString,
+                )
+        self.GetPartitions = channel.unary_unary(
+                '/order_queue.OrderQueueService/GetPartitions',
+                request_serializer=order__queue_dot_order__queue__pb2.Empty.SerializeToString,
+                response_deserializer=order__queue_dot_order__queue__pb2.PartitionsResponse.FromString,
+                )
 
 
 class OrderQueueServiceServicer(object):
@@ -35,12 +55,40 @@ class OrderQueueServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AcquireLease(self, request, context):
+        """Grants (or renews) the dequeue lease for the elected executor leader
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Dequeue(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Ack(self, request, context):
+        """Confirms a delivery; unacknowledged orders are redelivered after the visibility timeout
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Nack(self, request, context):
+        """Returns a delivery to the queue immediately
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetPartitions(self, request, context):
+        """Number of partitions, so executors can compute ownership before leasing any
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_OrderQueueServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -49,11 +97,31 @@ def add_OrderQueueServiceServicer_to_server(servicer, server):
                     request_deserializer=order__queue_dot_order__queue__pb2.OrderRequest.FromString,
                     response_serializer=order__queue_dot_order__queue__pb2.EnqueueResponse.SerializeToString,
             ),
+            'AcquireLease': grpc.unary_unary_rpc_method_handler(
+                    servicer.AcquireLease,
+                    request_deserializer=order__queue_dot_order__queue__pb2.LeaseRequest.FromString,
+                    response_serializer=order__queue_dot_order__queue__pb2.LeaseResponse.SerializeToString,
+            ),
             'Dequeue': grpc.unary_unary_rpc_method_handler(
                     servicer.Dequeue,
-                    request_deserializer=order__queue_dot_order__queue__pb2.Empty.FromString,
+                    request_deserializer=order__queue_dot_order__queue__pb2.DequeueRequest.FromString,
                     response_serializer=order__queue_dot_order__queue__pb2.DequeueResponse.SerializeToString,
             ),
+            'Ack': grpc.unary_unary_rpc_method_handler(
+                    servicer.Ack,
+                    request_deserializer=order__queue_dot_order__queue__pb2.AckRequest.FromString,
+                    response_serializer=order__queue_dot_order__queue__pb2.AckResponse.SerializeToString,
+            ),
+            'Nack': grpc.unary_unary_rpc_method_handler(
+                    servicer.Nack,
+                    request_deserializer=order__queue_dot_order__queue__pb2.AckRequest.FromString,
+                    response_serializer=order__queue_dot_order__queue__pb2.AckResponse.SerializeToString,
+            ),
+            'GetPartitions': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPartitions,
+                    request_deserializer=order__queue_dot_order__queue__pb2.Empty.FromString,
+                    response_serializer=order__queue_dot_order__queue__pb2.PartitionsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'order_queue.OrderQueueService', rpc_method_handlers)
@@ -81,6 +149,23 @@ class OrderQueueService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def AcquireLease(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/order_queue.OrderQueueService/AcquireLease',
+            order__queue_dot_order__queue__pb2.LeaseRequest.SerializeToString,
+            order__queue_dot_order__queue__pb2.LeaseResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Dequeue(request,
             target,
@@ -93,7 +178,58 @@ class OrderQueueService(object):
             timeout=None,
             metadata=None):
         return grpc.experimental.unary_unary(request, target, '/order_queue.OrderQueueService/Dequeue',
-            order__queue_dot_order__queue__pb2.Empty.SerializeToString,
+            order__queue_dot_order__queue__pb2.DequeueRequest.SerializeToString,
             order__queue_dot_order__queue__pb2.DequeueResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Ack(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/order_queue.OrderQueueService/Ack',
+            order__queue_dot_order__queue__pb2.AckRequest.SerializeToString,
+            order__queue_dot_order__queue__pb2.AckResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Nack(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/order_queue.OrderQueueService/Nack',
+            order__queue_dot_order__queue__pb2.AckRequest.SerializeToString,
+            order__queue_dot_order__queue__pb2.AckResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetPartitions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/order_queue.OrderQueueService/GetPartitions',
+            order__queue_dot_order__queue__pb2.Empty.SerializeToString,
+            order__queue_dot_order__queue__pb2.PartitionsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dsuggestions/suggestions.proto\x12\x0bsuggestions\",\n\x11SuggestionRequest\x12\x17\n\x0fpurchased_books\x18\x01 \x03(\t\"\xa9\x01\n\x12SuggestionResponse\x12\x17\n\x0fsuggested_books\x18\x01 \x03(\t\x12\x46\n\x0cvector_clock\x18\x02 \x03(\x0b\x32\x30.suggestions.SuggestionResponse.VectorClockEntry\x1a\x32\n\x10VectorClockEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\x32g\n\x12SuggestionsService\x12Q\n\x0eGetSuggestions\x12\x1e.suggestions.SuggestionRequest\x1a\x1f.suggestions.SuggestionResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dsuggestions/suggestions.proto\x12\x0bsuggestions\">\n\x11SuggestionRequest\x12\x17\n\x0fpurchased_books\x18\x01 \x03(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\"\xa9\x01\n\x12SuggestionResponse\x12\x17\n\x0fsuggested_books\x18\x01 \x03(\t\x12\x46\n\x0cvector_clock\x18\x02 \x03(\x0b\x32\x30.suggestions.SuggestionResponse.VectorClockEntry\x1a\x32\n\x10VectorClockEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"6\n\x13ObserveOrderRequest\x12\x10\n\x08order_id\x18\x01 \x01(\t\x12\r\n\x05\x62ooks\x18\x02 \x03(\t\"(\n\x14ObserveOrderResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x01(\x08\x32\xbc\x01\n\x12SuggestionsService\x12Q\n\x0eGetSuggestions\x12\x1e.suggestions.SuggestionRequest\x1a\x1f.suggestions.SuggestionResponse\x12S\n\x0cObserveOrder\x12 .suggestions.ObserveOrderRequest\x1a!.suggestions.ObserveOrderResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -24,11 +24,15 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_SUGGESTIONRESPONSE_VECTORCLOCKENTRY']._options = None
   _globals['_SUGGESTIONRESPONSE_VECTORCLOCKENTRY']._serialized_options = b'8\001'
   _globals['_SUGGESTIONREQUEST']._serialized_start=46
-  _globals['_SUGGESTIONREQUEST']._serialized_end=90
-  _globals['_SUGGESTIONRESPONSE']._serialized_start=93
-  _globals['_SUGGESTIONRESPONSE']._serialized_end=262
-  _globals['_SUGGESTIONRESPONSE_VECTORCLOCKENTRY']._serialized_start=212
-  _globals['_SUGGESTIONRESPONSE_VECTORCLOCKENTRY']._serialized_end=262
-  _globals['_SUGGESTIONSSERVICE']._serialized_start=264
-  _globals['_SUGGESTIONSSERVICE']._serialized_end=367
+  _globals['_SUGGESTIONREQUEST']._serialized_end=108
+  _globals['_SUGGESTIONRESPONSE']._serialized_start=111
+  _globals['_SUGGESTIONRESPONSE']._serialized_end=280
+  _globals['_SUGGESTIONRESPONSE_VECTORCLOCKENTRY']._serialized_start=230
+  _globals['_SUGGESTIONRESPONSE_VECTORCLOCKENTRY']._serialized_end=280
+  _globals['_OBSERVEORDERREQUEST']._serialized_start=282
+  _globals['_OBSERVEORDERREQUEST']._serialized_end=336
+  _globals['_OBSERVEORDERRESPONSE']._serialized_start=338
+  _globals['_OBSERVEORDERRESPONSE']._serialized_end=378
+  _globals['_SUGGESTIONSSERVICE']._serialized_start=381
+  _globals['_SUGGESTIONSSERVICE']._serialized_end=569
 # @@protoc_insertion_point(module_scope)
@@ -19,6 +19,11 @@ class SuggestionsServiceStub(object):
                 request_serializer=suggestions_dot_suggestions__pb2.SuggestionRequest.SerializeToString,
                 response_deserializer=suggestions_dot_suggestions__pb2.SuggestionResponse.FromString,
                 )
+        self.ObserveOrder = channel.unary_unary(
+                '/suggestions.SuggestionsService/ObserveOrder',
+                request_serializer=suggestions_dot_suggestions__pb2.ObserveOrderRequest.SerializeToString,
+                response_deserializer=suggestions_dot_suggestions__pb2.ObserveOrderResponse.FromString,
+                )
 
 
 class SuggestionsServiceServicer(object):
@@ -30,6 +35,13 @@ class SuggestionsServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ObserveOrder(self, request, context):
+        """Feeds a completed order into the co-purchase index
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_SuggestionsServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -38,6 +50,11 @@ def add_SuggestionsServiceServicer_to_server(servicer, server):
                     request_deserializer=suggestions_dot_suggestions__pb2.SuggestionRequest.FromString,
                     response_serializer=suggestions_dot_suggestions__pb2.SuggestionResponse.SerializeToString,
             ),
+            'ObserveOrder': grpc.unary_unary_rpc_method_handler(
+                    servicer.ObserveOrder,
+                    request_deserializer=suggestions_dot_suggestions__pb2.ObserveOrderRequest.FromString,
+                    response_serializer=suggestions_dot_suggestions__pb2.ObserveOrderResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'suggestions.SuggestionsService', rpc_method_handlers)
@@ -64,3 +81,20 @@ class SuggestionsService(object):
             suggestions_dot_suggestions__pb2.SuggestionResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ObserveOrder(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/suggestions.SuggestionsService/ObserveOrder',
+            suggestions_dot_suggestions__pb2.ObserveOrderRequest.SerializeToString,
+            suggestions_dot_suggestions__pb2.ObserveOrderResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)